@@ -1,9 +1,15 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.contrib.auth.models import Group, User
-from django.utils.safestring import mark_safe
+from django.db.models import Count
+from django.forms.models import BaseInlineFormSet
+from django.utils.html import format_html
 
+from .constants import INLINE_POSTS_LIMIT
 from .models import Post, Category, Comment, Location
+from .search import search_posts
+
+USERNAME_RANGE_END = '\U0010ffff'
 
 
 @admin.register(Post)
@@ -25,23 +31,41 @@ class PostsAdmin(admin.ModelAdmin):
     )
     list_filter = (
         'category',
-        'author',
         'is_published'
     )
     list_editable = (
         'text',
         'pub_date',
-        'author',
         'is_published'
     )
+    list_select_related = (
+        'category',
+        'author',
+    )
+    show_full_result_count = False
     search_fields = (
         'title',
     )
+    autocomplete_fields = (
+        'author',
+        'category',
+        'location',
+    )
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term:
+            return super().get_search_results(
+                request, queryset, search_term
+            )
+        return search_posts(queryset, search_term, snippets=False), False
 
     def get_image(self, obj):
         if not (obj.pk and obj.image):
             return ''
-        return mark_safe(f'<img src={obj.image.url} width="80" height="60">')
+        return format_html(
+            '<img src="{}" width="80" height="60" loading="lazy">',
+            obj.thumbnail_url
+        )
     get_image.short_description = 'Изображение'
 
 
@@ -63,9 +87,32 @@ class LocationAdmin(admin.ModelAdmin):
     )
 
 
+class LimitedPostFormSet(BaseInlineFormSet):
+    def get_queryset(self):
+        if not hasattr(self, '_queryset'):
+            self._queryset = super().get_queryset()[:INLINE_POSTS_LIMIT]
+        return self._queryset
+
+
 class PostInline(admin.TabularInline):
     model = Post
+    formset = LimitedPostFormSet
     extra = 0
+    fields = (
+        'title',
+        'pub_date',
+        'author',
+        'location',
+        'is_published',
+    )
+    autocomplete_fields = (
+        'author',
+        'location',
+    )
+    show_change_link = True
+    verbose_name_plural = (
+        f'Последние {INLINE_POSTS_LIMIT} публикаций категории'
+    )
 
 
 @admin.register(Category)
@@ -99,6 +146,14 @@ class CommentAdmin(admin.ModelAdmin):
         'text',
         'author',
     )
+    list_select_related = (
+        'author',
+    )
+    autocomplete_fields = (
+        'post',
+        'author',
+    )
+    show_full_result_count = False
 
 
 admin.site.unregister(User)
@@ -111,7 +166,38 @@ class UserAdmin(BaseUserAdmin):
         'username',
         'posts_count',
     )
-
-    @admin.display(description='Кол-во постов у пользователя')
+    show_full_result_count = False
+
+    @staticmethod
+    def is_autocomplete(request):
+        return request.resolver_match.url_name == 'autocomplete'
+
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        if self.is_autocomplete(request):
+            return queryset
+        return queryset.annotate(posts_count=Count('posts'))
+
+    def get_search_results(self, request, queryset, search_term):
+        """Автодополнение ищет по началу имени с учётом регистра.
+
+        Такое условие SQLite выполняет по индексу поля username, а поиск
+        в списке пользователей остаётся поиском BaseUserAdmin.
+        """
+        if not self.is_autocomplete(request):
+            return super().get_search_results(
+                request, queryset, search_term
+            )
+        if not search_term:
+            return queryset, False
+        return queryset.filter(
+            username__gte=search_term,
+            username__lt=search_term + USERNAME_RANGE_END,
+        ), False
+
+    @admin.display(
+        description='Кол-во постов у пользователя',
+        ordering='posts_count',
+    )
     def posts_count(self, obj):
-        return obj.posts.count()
+        return obj.posts_count
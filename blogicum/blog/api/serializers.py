@@ -0,0 +1,100 @@
+"""Поля JSON API и их сериализация.
+
+Поле описывается путями модели, которые нужно загрузить через `only()`,
+и функцией, получающей значение из объекта. Клиент выбирает поля
+параметром `fields`, и из базы читаются только нужные столбцы.
+"""
+import json
+from collections import namedtuple
+from operator import attrgetter
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+ApiField = namedtuple('ApiField', ('paths', 'getter'))
+
+
+class InvalidFields(ValueError):
+    pass
+
+
+def related_value(relation, field, visible=None):
+    def getter(obj):
+        related = getattr(obj, relation)
+        if related is None or (visible and not getattr(related, visible)):
+            return None
+        return getattr(related, field)
+    paths = [f'{relation}__{field}']
+    if visible:
+        paths.append(f'{relation}__{visible}')
+    return ApiField(tuple(paths), getter)
+
+
+def model_field(name):
+    return ApiField((name,), attrgetter(name))
+
+
+POST_FIELDS = {
+    'id': model_field('id'),
+    'title': model_field('title'),
+    'excerpt': model_field('excerpt'),
+    'text': model_field('text'),
+    'pub_date': model_field('pub_date'),
+    'updated_at': model_field('updated_at'),
+    'comment_count': model_field('comment_count'),
+    'image': ApiField(
+        ('image',), lambda post: post.image.url if post.image else None
+    ),
+    'author': related_value('author', 'username'),
+    'category': related_value('category', 'slug'),
+    'location': related_value('location', 'name', visible='is_published'),
+}
+POST_LIST_FIELDS = (
+    'id', 'title', 'excerpt', 'pub_date', 'author', 'category', 'location',
+    'comment_count',
+)
+POST_DETAIL_FIELDS = (*POST_LIST_FIELDS, 'text', 'image', 'updated_at')
+
+COMMENT_FIELDS = {
+    'id': model_field('id'),
+    'text': model_field('text'),
+    'created_at': model_field('created_at'),
+    'post': ApiField(('post',), attrgetter('post_id')),
+    'author': related_value('author', 'username'),
+}
+
+CATEGORY_FIELDS = {
+    'slug': model_field('slug'),
+    'title': model_field('title'),
+    'description': model_field('description'),
+    'created_at': model_field('created_at'),
+}
+
+
+def parse_fields(raw, available, default):
+    if not raw:
+        return tuple(default)
+    names = tuple(dict.fromkeys(
+        name.strip() for name in raw.split(',') if name.strip()
+    ))
+    unknown = [name for name in names if name not in available]
+    if unknown or not names:
+        raise InvalidFields(
+            f'Неизвестные поля: {", ".join(unknown)}' if unknown
+            else 'Не указаны поля'
+        )
+    return names
+
+
+def field_paths(names, available, *required):
+    paths = dict.fromkeys(required)
+    for name in names:
+        paths.update(dict.fromkeys(available[name].paths))
+    return tuple(paths)
+
+
+def dump(obj, names, available):
+    return json.dumps(
+        {name: available[name].getter(obj) for name in names},
+        cls=DjangoJSONEncoder,
+        ensure_ascii=False,
+    )
@@ -0,0 +1,25 @@
+from django.urls import path
+
+from . import views
+
+app_name = 'api'
+urlpatterns = [
+    path('posts/',
+         views.PostListApiView.as_view(),
+         name='posts'),
+    path('posts/<int:post_pk>/',
+         views.PostDetailApiView.as_view(),
+         name='post'),
+    path('posts/<int:post_pk>/comments/',
+         views.CommentListApiView.as_view(),
+         name='comments'),
+    path('categories/',
+         views.CategoryListApiView.as_view(),
+         name='categories'),
+    path('categories/<slug:category>/posts/',
+         views.CategoryPostListApiView.as_view(),
+         name='category_posts'),
+    path('profiles/<slug:username>/posts/',
+         views.ProfilePostListApiView.as_view(),
+         name='profile_posts'),
+]
@@ -0,0 +1,179 @@
+import json
+from http import HTTPStatus
+
+from django.contrib.auth import get_user_model
+from django.http import (
+    Http404, HttpResponse, JsonResponse, StreamingHttpResponse
+)
+from django.shortcuts import get_object_or_404
+from django.views.generic import View
+
+from blog.constants import API_MAX_PAGE_SIZE, PAGINATION
+from blog.models import Category, Comment, Post
+from blog.paginator import CursorPaginator, InvalidCursor
+from blog.views import filter_posts_by_date, get_post_or_404, only_fields
+
+from .serializers import (
+    CATEGORY_FIELDS, COMMENT_FIELDS, POST_DETAIL_FIELDS, POST_FIELDS,
+    POST_LIST_FIELDS, InvalidFields, dump, field_paths, parse_fields
+)
+
+User = get_user_model()
+
+
+class InvalidLimit(ValueError):
+    pass
+
+
+class ApiView(View):
+    """Базовый view JSON API: только чтение, ошибки отдаются в JSON."""
+
+    read_from_replica = True
+    http_method_names = ['get', 'head', 'options']
+    available_fields = POST_FIELDS
+    default_fields = POST_LIST_FIELDS
+
+    def get_fields(self):
+        return parse_fields(
+            self.request.GET.get('fields'),
+            self.available_fields,
+            self.default_fields,
+        )
+
+    def dispatch(self, request, *args, **kwargs):
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        except Http404 as error:
+            return JsonResponse(
+                {'detail': str(error) or 'Не найдено'},
+                status=HTTPStatus.NOT_FOUND,
+            )
+        except (InvalidCursor, InvalidFields, InvalidLimit) as error:
+            return JsonResponse(
+                {'detail': str(error)}, status=HTTPStatus.BAD_REQUEST
+            )
+
+
+class ApiListView(ApiView):
+    """Список с курсором по ключу (cursor_field, id) от новых к старым.
+
+    Строки страницы (не больше API_MAX_PAGE_SIZE + 1) читаются внутри
+    view, поэтому запросы идут к выбранной для запроса базе и учитываются
+    в Server-Timing. Потоком отдаётся только сериализация по одному
+    объекту; курсор следующей страницы отдаётся в поле `next` после
+    списка `results`.
+    """
+
+    model = Post
+    cursor_field = 'pub_date'
+
+    def get_queryset(self):
+        return self.model._default_manager.all()
+
+    def get_limit(self):
+        try:
+            limit = int(self.request.GET.get('limit', PAGINATION))
+        except ValueError:
+            limit = 0
+        if not 1 <= limit <= API_MAX_PAGE_SIZE:
+            raise InvalidLimit(
+                f'Параметр limit должен быть от 1 до {API_MAX_PAGE_SIZE}'
+            )
+        return limit
+
+    def get(self, request, *args, **kwargs):
+        fields = self.get_fields()
+        limit = self.get_limit()
+        paginator = CursorPaginator(
+            only_fields(
+                self.get_queryset(),
+                field_paths(
+                    fields, self.available_fields, 'id', self.cursor_field
+                ),
+            ),
+            limit,
+            self.cursor_field,
+        )
+        rows = list(
+            paginator.older_than(request.GET.get('cursor'))[:limit + 1]
+        )
+        return StreamingHttpResponse(
+            self.stream(paginator, rows, fields),
+            content_type='application/json',
+        )
+
+    def stream(self, paginator, rows, fields):
+        yield '{"results": ['
+        next_cursor = last = None
+        for index, obj in enumerate(rows):
+            if index == paginator.per_page:
+                next_cursor = paginator.cursor_for(last)
+                break
+            yield (',' if index else '') + dump(
+                obj, fields, self.available_fields
+            )
+            last = obj
+        yield f'], "next": {json.dumps(next_cursor)}}}'
+
+
+class PostListApiView(ApiListView):
+    def get_queryset(self):
+        return filter_posts_by_date(super().get_queryset())
+
+
+class CategoryPostListApiView(ApiListView):
+    def get_queryset(self):
+        category = get_object_or_404(
+            Category, is_published=True, slug=self.kwargs['category']
+        )
+        return filter_posts_by_date(category.posts.all())
+
+
+class ProfilePostListApiView(ApiListView):
+    def get_queryset(self):
+        profile = get_object_or_404(User, username=self.kwargs['username'])
+        if self.request.user.pk == profile.pk:
+            return profile.posts.all()
+        return filter_posts_by_date(profile.posts.all())
+
+
+class CategoryListApiView(ApiListView):
+    model = Category
+    cursor_field = 'created_at'
+    available_fields = CATEGORY_FIELDS
+    default_fields = ('slug', 'title', 'description')
+
+    def get_queryset(self):
+        return super().get_queryset().filter(is_published=True)
+
+
+class CommentListApiView(ApiListView):
+    model = Comment
+    cursor_field = 'created_at'
+    available_fields = COMMENT_FIELDS
+    default_fields = ('id', 'text', 'created_at', 'author')
+
+    def get_queryset(self):
+        return super().get_queryset().filter(post=get_post_or_404(
+            self.request.user,
+            self.kwargs['post_pk'],
+            Post.objects.only('is_published', 'author'),
+        ))
+
+
+class PostDetailApiView(ApiView):
+    default_fields = POST_DETAIL_FIELDS
+
+    def get(self, request, *args, **kwargs):
+        fields = self.get_fields()
+        post = get_post_or_404(
+            request.user,
+            self.kwargs['post_pk'],
+            only_fields(Post.objects.all(), field_paths(
+                fields, self.available_fields, 'is_published', 'author'
+            )),
+        )
+        return HttpResponse(
+            dump(post, fields, self.available_fields),
+            content_type='application/json',
+        )
@@ -0,0 +1,286 @@
+"""Потоковая загрузка фикстур и больших выгрузок через bulk_create.
+
+Объекты читаются из JSON-массива фикстуры (`dumpdata`) или из файла
+JSON Lines по одному, копятся пачками и вставляются `bulk_create`, каждая
+пачка — в своей транзакции. Объекты, ссылающиеся на ещё не загруженные
+записи, откладываются до конца загрузки, поэтому в базу не попадают
+строки с несуществующими внешними ключами. Сигналы при этом не
+отправляются, поэтому `BulkLoader.refresh()` сам пересчитывает
+денормализованные поля публикаций: начало текста, число комментариев,
+видимость, время изменения и полнотекстовый индекс.
+"""
+import json
+import time
+from collections import Counter
+
+from django.core.serializers.python import Deserializer
+from django.db import connections, transaction
+from django.db.models import Q
+from django.utils.timezone import now
+
+from .comment_counts import comment_count_subquery
+from .constants import BULK_LOAD_BATCH_SIZE, BULK_LOAD_READ_SIZE
+from .models import Post, make_excerpt
+from .search import index_posts
+from .visibility import refresh_visibility, set_posts_visibility
+
+LOADED_MODELS = (
+    'auth.user', 'blog.category', 'blog.location', 'blog.post',
+    'blog.comment',
+)
+JSON_WHITESPACE = ' \t\n\r'
+
+
+def skip_separators(buffer, position, separators):
+    while position < len(buffer) and buffer[position] in separators:
+        position += 1
+    return position
+
+
+def iter_json_array(file, read_size=BULK_LOAD_READ_SIZE):
+    """Отдаёт элементы JSON-массива, не читая файл целиком."""
+    decoder = json.JSONDecoder()
+    buffer, position, eof = '', 0, False
+    separators = None
+    while True:
+        position = skip_separators(
+            buffer, position, separators or JSON_WHITESPACE
+        )
+        if position < len(buffer):
+            if separators is None:
+                if buffer[position] != '[':
+                    raise ValueError('Фикстура должна быть JSON-массивом')
+                separators = JSON_WHITESPACE + ','
+                position += 1
+                continue
+            if buffer[position] == ']':
+                return
+            try:
+                item, position = decoder.raw_decode(buffer, position)
+                yield item
+                continue
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+        elif eof:
+            raise ValueError('Неожиданный конец файла')
+        chunk = file.read(read_size)
+        buffer, position, eof = buffer[position:] + chunk, 0, not chunk
+
+
+def iter_json_lines(file):
+    for line in file:
+        if line.strip():
+            yield json.loads(line)
+
+
+def chunked(values, size):
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+def pk_batches(queryset, size):
+    last_pk = 0
+    while True:
+        batch = list(
+            queryset.filter(pk__gt=last_pk)
+            .order_by('pk')
+            .values_list('pk', flat=True)[:size]
+        )
+        if not batch:
+            return
+        yield batch
+        last_pk = batch[-1]
+
+
+class BulkLoader:
+    def __init__(self, using, batch_size=BULK_LOAD_BATCH_SIZE, report=None):
+        self.using = using
+        self.batch_size = batch_size
+        self.report = report
+        self.pending = {label: [] for label in LOADED_MODELS}
+        self.waiting = {label: [] for label in LOADED_MODELS}
+        self.loaded = Counter()
+        self.skipped = Counter()
+        self.ignored_relations = 0
+        self.post_pks = set()
+        self.full_refresh = False
+        self.started = time.perf_counter()
+
+    @property
+    def total(self):
+        return sum(self.loaded.values())
+
+    @property
+    def rate(self):
+        return self.total / max(time.perf_counter() - self.started, 1e-9)
+
+    def add(self, data):
+        label = str(data.get('model', '')).lower()
+        if label not in self.pending:
+            self.skipped[label] += 1
+            return
+        deserialized = next(Deserializer([data], using=self.using))
+        if any(deserialized.m2m_data.values()):
+            self.ignored_relations += 1
+        obj = deserialized.object
+        if label == 'blog.post':
+            obj.excerpt = make_excerpt(obj.text)
+            if obj.pk is None:
+                obj.comment_count = 0
+        self.pending[label].append(obj)
+        if len(self.pending[label]) >= self.batch_size:
+            self.flush()
+
+    def insert(self, objs):
+        model = type(objs[0])
+        created = [
+            field for field in model._meta.concrete_fields
+            if getattr(field, 'auto_now_add', False)
+        ]
+        values = [
+            [getattr(obj, field.attname) for field in created]
+            for obj in objs
+        ]
+        model._base_manager.using(self.using).bulk_create(
+            objs, self.batch_size
+        )
+        restored = []
+        for obj, row in zip(objs, values):
+            changed = False
+            for field, value in zip(created, row):
+                if value is not None:
+                    setattr(obj, field.attname, value)
+                    changed = True
+            if changed and obj.pk is not None:
+                restored.append(obj)
+        if restored:
+            model._base_manager.using(self.using).bulk_update(
+                restored, [field.name for field in created], self.batch_size
+            )
+
+    @property
+    def query_batch_size(self):
+        return min(
+            self.batch_size,
+            connections[self.using].features.max_query_params
+            or self.batch_size,
+        )
+
+    def missing_targets(self, objs):
+        """Возвращает объекты, внешние ключи которых ещё не существуют."""
+        missing = set()
+        for field in objs[0]._meta.concrete_fields:
+            if not field.many_to_one:
+                continue
+            targets = {
+                getattr(obj, field.attname) for obj in objs
+            } - {None}
+            existing = set()
+            for batch in chunked(sorted(targets), self.query_batch_size):
+                existing.update(
+                    field.related_model._base_manager.using(self.using)
+                    .filter(pk__in=batch).values_list('pk', flat=True)
+                )
+            missing.update(
+                index for index, obj in enumerate(objs)
+                if getattr(obj, field.attname) not in existing | {None}
+            )
+        return missing
+
+    def flush(self):
+        with transaction.atomic(using=self.using):
+            for label, objs in self.pending.items():
+                if not objs:
+                    continue
+                missing = self.missing_targets(objs)
+                self.waiting[label].extend(objs[i] for i in sorted(missing))
+                objs = [
+                    obj for index, obj in enumerate(objs)
+                    if index not in missing
+                ]
+                self.pending[label] = []
+                if not objs:
+                    continue
+                self.insert(objs)
+                if label == 'blog.post':
+                    pks = [obj.pk for obj in objs if obj.pk is not None]
+                    self.full_refresh |= len(pks) < len(objs)
+                    index_posts(pks, self.using)
+                    self.post_pks.update(pks)
+                elif label == 'blog.comment':
+                    self.post_pks.update(
+                        obj.post_id for obj in objs if obj.post_id
+                    )
+                self.loaded[label] += len(objs)
+        if self.report:
+            self.report(self)
+
+    def flush_waiting(self):
+        """Повторяет вставку отложенных объектов, пока она удаётся."""
+        while True:
+            loaded = self.total
+            waiting, self.waiting = self.waiting, {
+                label: [] for label in LOADED_MODELS
+            }
+            for label, objs in waiting.items():
+                for batch in chunked(objs, self.batch_size):
+                    self.pending[label] = batch
+                    self.flush()
+            if self.total == loaded:
+                return
+
+    def refresh_posts(self, posts):
+        set_posts_visibility(
+            posts.exclude(
+                Q(is_published=True) & Q(category__is_published=True)
+            ),
+            False,
+            self.batch_size,
+        )
+        set_posts_visibility(posts, True, self.batch_size)
+        posts.update(
+            comment_count=comment_count_subquery(), updated_at=now()
+        )
+
+    def refresh(self):
+        """Обновляет загруженные публикации и публикации комментариев.
+
+        Если у части публикаций не было первичного ключа, обновляются
+        все публикации.
+        """
+        posts = Post.objects.using(self.using)
+        if self.full_refresh:
+            batches = pk_batches(posts, self.query_batch_size)
+        else:
+            batches = chunked(sorted(self.post_pks), self.query_batch_size)
+        for pks in batches:
+            with transaction.atomic(using=self.using):
+                self.refresh_posts(posts.filter(pk__in=pks))
+                if self.full_refresh:
+                    index_posts(pks, self.using)
+        self.post_pks = set()
+        self.full_refresh = False
+        refresh_visibility()
+
+    def finish(self):
+        """Дописывает оставшиеся объекты и обновляет публикации.
+
+        Объекты, внешние ключи которых так и не нашлись, не загружаются:
+        после обновления уже загруженных публикаций выбрасывается
+        ValueError.
+        """
+        self.flush()
+        self.flush_waiting()
+        self.refresh()
+        unresolved = {
+            label: len(objs) for label, objs in self.waiting.items() if objs
+        }
+        if unresolved:
+            raise ValueError(
+                'Не найдены записи, на которые ссылаются объекты: '
+                + ', '.join(
+                    f'{label}: {count}'
+                    for label, count in unresolved.items()
+                )
+            )
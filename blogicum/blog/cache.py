@@ -0,0 +1,101 @@
+import hashlib
+import time
+from itertools import count
+
+from django.core.cache import caches
+from django.http import HttpResponse
+
+from .constants import PAGE_CACHE_ALIAS, PAGE_CACHE_TIMEOUT
+
+PAGE_KEY_PARAMS = ('page', 'after', 'before')
+CACHED_HEADERS = ('Content-Type', 'ETag', 'Last-Modified')
+VISIBILITY_TAG = 'visibility'
+
+_version_counter = count()
+
+
+def get_cache():
+    return caches[PAGE_CACHE_ALIAS]
+
+
+def tag_key(tag):
+    return f'blog:tag:{tag}'
+
+
+def page_key(request):
+    params = '&'.join(
+        f'{name}={request.GET[name]}'
+        for name in PAGE_KEY_PARAMS if name in request.GET
+    )
+    digest = hashlib.md5(f'{request.path}?{params}'.encode()).hexdigest()
+    return f'blog:page:{digest}'
+
+
+def new_version():
+    return f'{time.time_ns()}.{next(_version_counter)}'
+
+
+def get_tag_versions(tags):
+    """Возвращает текущие версии тегов, создавая недостающие.
+
+    Вытесненный из кэша тег получает новую версию, поэтому страницы,
+    сохранённые со старой версией, считаются устаревшими.
+    """
+    cache = get_cache()
+    keys = {tag: tag_key(tag) for tag in tags}
+    stored = cache.get_many(keys.values())
+    missing = {
+        key: new_version() for key in keys.values() if key not in stored
+    }
+    if missing:
+        cache.set_many(missing, None)
+        stored.update(cache.get_many(missing))
+    return {tag: stored.get(key) for tag, key in keys.items()}
+
+
+def invalidate_tags(*tags):
+    get_cache().set_many(
+        {tag_key(tag): new_version() for tag in tags if tag}, None
+    )
+
+
+def post_tags(posts):
+    tags = set()
+    for post in posts:
+        tags.update((
+            f'post:{post.pk}',
+            f'user:{post.author_id}',
+            f'category:{post.category_id}',
+            f'location:{post.location_id}',
+        ))
+    return tags
+
+
+def get_cached_page(key):
+    entry = get_cache().get(key)
+    if entry is None:
+        return None
+    versions, content, headers = entry
+    if get_tag_versions(versions) != versions:
+        return None
+    response = HttpResponse(content)
+    for name, value in headers.items():
+        response[name] = value
+    return response
+
+
+def store_page(key, response, versions):
+    headers = {
+        name: response[name]
+        for name in CACHED_HEADERS if response.has_header(name)
+    }
+    get_cache().set(
+        key, (versions, response.content, headers), PAGE_CACHE_TIMEOUT
+    )
+
+
+def card_key(post):
+    return (
+        f'blog:card:{post.pk}:{post.updated_at.timestamp()}'
+        f':{post.comment_count}'
+    )
@@ -0,0 +1,59 @@
+"""Стратегии подсчёта комментариев для ленты публикаций.
+
+* STORED — денормализованное поле `Post.comment_count`;
+* SUBQUERY — коррелированный подзапрос, который выполняется только
+  для строк текущей страницы;
+* JOIN — `Count('comments')` через JOIN и GROUP BY по всем столбцам;
+* BATCHED — отдельный запрос `post_id IN (...)` по публикациям страницы.
+
+Подсчитанное значение записывается в `comment_count` публикаций страницы.
+"""
+from django.core.exceptions import ImproperlyConfigured
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from .models import Comment
+
+STORED = 'stored'
+SUBQUERY = 'subquery'
+JOIN = 'join'
+BATCHED = 'batched'
+STRATEGIES = (STORED, SUBQUERY, JOIN, BATCHED)
+
+
+def comment_count_subquery():
+    return Coalesce(Subquery(
+        Comment.objects.filter(
+            post=OuterRef('pk')
+        ).order_by().values('post').annotate(
+            total=Count('pk')
+        ).values('total')
+    ), 0)
+
+
+def annotate_comment_count(queryset, strategy):
+    if strategy not in STRATEGIES:
+        raise ImproperlyConfigured(
+            f'Неизвестная стратегия подсчёта комментариев: {strategy}'
+        )
+    if strategy == SUBQUERY:
+        return queryset.annotate(live_comment_count=comment_count_subquery())
+    if strategy == JOIN:
+        return queryset.annotate(live_comment_count=Count('comments'))
+    return queryset
+
+
+def fill_comment_counts(posts, strategy):
+    if strategy in (SUBQUERY, JOIN):
+        for post in posts:
+            post.comment_count = post.live_comment_count
+    elif strategy == BATCHED and posts:
+        counts = dict(
+            Comment.objects.filter(
+                post__in=[post.pk for post in posts]
+            ).order_by().values('post').annotate(
+                total=Count('pk')
+            ).values_list('post', 'total')
+        )
+        for post in posts:
+            post.comment_count = counts.get(post.pk, 0)
@@ -1,3 +1,42 @@
 MAX_LENGTH = 256
 SIZE_CUT_TITLE = 20
 PAGINATION = 10
+CURSOR_PAGINATION = False
+PAGE_CACHE_ALIAS = 'default'
+PAGE_CACHE_TIMEOUT = 60 * 15
+VISIBILITY_BUCKET = 0
+VISIBILITY_MAX_AGE = 30
+VISIBILITY_BATCH_SIZE = 1000
+THUMBNAIL_WIDTHS = (320, 640)
+THUMBNAIL_QUALITY = 80
+INLINE_POSTS_LIMIT = 20
+EXCERPT_WORDS = 10
+POST_CARD_FIELDS = (
+    'id', 'title', 'excerpt', 'pub_date', 'is_published', 'updated_at',
+    'image', 'image_size', 'comment_count',
+    'author__username',
+    'category__title', 'category__slug', 'category__is_published',
+    'location__name', 'location__is_published',
+)
+POST_SEARCH_FIELDS = (
+    'id', 'title', 'pub_date',
+    'author__username',
+    'category__title', 'category__slug',
+)
+COMMENT_FIELDS = (
+    'id', 'text', 'created_at', 'post_id', 'author__username',
+)
+PAGINATION_WINDOW = 2
+PAGINATION_MAX_COUNT = 10000
+COMMENT_COUNT_STRATEGY = 'stored'
+POST_CARD_TIMEOUT = 60 * 60 * 24
+FEED_ITEMS = 20
+FEED_FIELDS = (
+    'id', 'title', 'excerpt', 'pub_date', 'updated_at', 'location',
+    'author__username', 'category__title',
+)
+SITEMAP_LIMIT = 50000
+SITEMAP_CHUNK_SIZE = 2000
+API_MAX_PAGE_SIZE = 100
+BULK_LOAD_BATCH_SIZE = 1000
+BULK_LOAD_READ_SIZE = 64 * 1024
@@ -0,0 +1,173 @@
+"""RSS и Atom ленты публикаций.
+
+Готовые ленты хранятся в кэше страниц и помечены теми же тегами, что и
+страницы ленты, поэтому пересобираются при первом запросе после записи
+публикации. Читатели лент получают ETag и 304 Not Modified.
+"""
+import hashlib
+from collections import namedtuple
+
+from django.contrib.auth import get_user_model
+from django.contrib.syndication.views import Feed
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils.feedgenerator import Atom1Feed
+from django.utils.http import quote_etag
+
+from blogicum.routers import read_from_primary
+
+from .cache import (
+    VISIBILITY_TAG, get_cached_page, get_tag_versions, page_key, post_tags,
+    store_page
+)
+from .constants import FEED_FIELDS, FEED_ITEMS
+from .mixin import not_modified
+from .models import Category, Post
+from .views import annotate_comments, filter_posts_by_date
+from .visibility import visibility_cutoff
+
+User = get_user_model()
+
+FeedSource = namedtuple('FeedSource', ('owner', 'posts'))
+
+
+class CachedPostsFeed(Feed):
+    read_from_replica = True
+
+    def __call__(self, request, *args, **kwargs):
+        visibility_cutoff()
+        key = page_key(request)
+        response = get_cached_page(key)
+        if response is None:
+            read_from_primary()
+            source = self.get_object(request, *args, **kwargs)
+            versions = get_tag_versions(
+                self.get_cache_tags(source.owner) | post_tags(source.posts)
+            )
+            response = super().__call__(request, *args, **kwargs)
+            response['ETag'] = quote_etag(
+                hashlib.md5(response.content).hexdigest()
+            )
+            store_page(key, response, versions)
+        return not_modified(request, response['ETag']) or response
+
+    def get_owner(self, request, **kwargs):
+        return None
+
+    def get_posts(self, owner):
+        return Post.objects.all()
+
+    def get_cache_tags(self, owner):
+        return {VISIBILITY_TAG}
+
+    def get_object(self, request, *args, **kwargs):
+        if getattr(request, '_feed_source', None) is None:
+            owner = self.get_owner(request, **kwargs)
+            request._feed_source = FeedSource(owner, list(
+                filter_posts_by_date(
+                    annotate_comments(self.get_posts(owner), FEED_FIELDS)
+                )[:FEED_ITEMS]
+            ))
+        return request._feed_source
+
+    def items(self, source):
+        return source.posts
+
+    def item_title(self, post):
+        return post.title
+
+    def item_description(self, post):
+        return post.excerpt
+
+    def item_link(self, post):
+        return reverse('blog:post_detail', args=[post.pk])
+
+    def item_pubdate(self, post):
+        return post.pub_date
+
+    def item_updateddate(self, post):
+        return post.updated_at
+
+    def item_author_name(self, post):
+        return post.author.username
+
+    def item_categories(self, post):
+        return [post.category.title] if post.category_id else []
+
+
+class PostsFeed(CachedPostsFeed):
+    title = 'Блогикум'
+    description = 'Новые публикации Блогикума'
+
+    def link(self):
+        return reverse('blog:index')
+
+    def get_cache_tags(self, owner):
+        return super().get_cache_tags(owner) | {'feed'}
+
+
+class CategoryPostsFeed(CachedPostsFeed):
+
+    def get_owner(self, request, **kwargs):
+        return get_object_or_404(
+            Category, is_published=True, slug=kwargs['category']
+        )
+
+    def get_posts(self, category):
+        return category.posts.all()
+
+    def get_cache_tags(self, category):
+        return super().get_cache_tags(category) | {
+            f'category:{category.id}', f'feed:category:{category.id}'
+        }
+
+    def title(self, source):
+        return f'Блогикум: {source.owner.title}'
+
+    def description(self, source):
+        return source.owner.description
+
+    def link(self, source):
+        return reverse('blog:category_posts', args=[source.owner.slug])
+
+
+class AuthorPostsFeed(CachedPostsFeed):
+
+    def get_owner(self, request, **kwargs):
+        return get_object_or_404(User, username=kwargs['username'])
+
+    def get_posts(self, author):
+        return author.posts.all()
+
+    def get_cache_tags(self, author):
+        return super().get_cache_tags(author) | {
+            f'user:{author.id}', f'feed:user:{author.id}'
+        }
+
+    def title(self, source):
+        return f'Блогикум: публикации @{source.owner.username}'
+
+    def description(self, source):
+        return f'Новые публикации пользователя @{source.owner.username}'
+
+    def link(self, source):
+        return reverse('profile', args=[source.owner.username])
+
+
+class PostsAtomFeed(PostsFeed):
+    feed_type = Atom1Feed
+    subtitle = PostsFeed.description
+
+
+class CategoryPostsAtomFeed(CategoryPostsFeed):
+    feed_type = Atom1Feed
+
+    def subtitle(self, source):
+        return self.description(source)
+
+
+class AuthorPostsAtomFeed(AuthorPostsFeed):
+    feed_type = Atom1Feed
+
+    def subtitle(self, source):
+        return self.description(source)
@@ -0,0 +1,107 @@
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from PIL import Image
+
+from .constants import THUMBNAIL_QUALITY, THUMBNAIL_WIDTHS
+
+WEBP = 'webp'
+
+
+def thumbnail_format(name):
+    return 'PNG' if name.lower().endswith('.png') else 'JPEG'
+
+
+def variant_name(name, width, extension=None):
+    """Имя копии строится из полного имени оригинала: `a.png.320w.webp`.
+
+    Поэтому копии `a.jpg` и `a.png` не совпадают.
+    """
+    if extension is None:
+        extension = 'png' if thumbnail_format(name) == 'PNG' else 'jpg'
+    if extension == WEBP and not width and name.lower().endswith('.webp'):
+        return name
+    suffix = f'.{width}w' if width else ''
+    return f'{name}{suffix}.{extension}'
+
+
+def all_variant_names(name):
+    names = {variant_name(name, None, WEBP)}
+    for width in THUMBNAIL_WIDTHS:
+        names.add(variant_name(name, width))
+        names.add(variant_name(name, width, WEBP))
+    names.discard(name)
+    return names
+
+
+def variant_widths(image_width):
+    return [width for width in THUMBNAIL_WIDTHS if width < image_width]
+
+
+def build_srcset(image, image_width, webp=False):
+    if not (image and image_width):
+        return ''
+    extension = WEBP if webp else None
+    candidates = [
+        (image.storage.url(variant_name(image.name, width, extension)), width)
+        for width in variant_widths(image_width)
+    ]
+    original = (
+        image.storage.url(variant_name(image.name, None, WEBP))
+        if webp else image.url
+    )
+    candidates.append((original, image_width))
+    return ', '.join(f'{url} {width}w' for url, width in candidates)
+
+
+def smallest_variant_url(image, image_width):
+    widths = variant_widths(image_width or 0)
+    if not widths:
+        return image.url
+    return image.storage.url(variant_name(image.name, widths[0]))
+
+
+def save_variant(storage, name, picture, image_format, force):
+    if storage.exists(name):
+        if not force:
+            return
+        storage.delete(name)
+    buffer = BytesIO()
+    if image_format == 'JPEG' and picture.mode != 'RGB':
+        picture = picture.convert('RGB')
+    picture.save(buffer, format=image_format, quality=THUMBNAIL_QUALITY)
+    storage.save(name, ContentFile(buffer.getvalue()))
+
+
+def generate_variants(image, force=False):
+    """Создаёт уменьшенные копии и WebP-версии рядом с оригиналом.
+
+    Возвращает ширину и высоту оригинального изображения.
+    """
+    storage = image.storage
+    with storage.open(image.name) as source:
+        original = Image.open(source)
+        original.load()
+    width, height = original.size
+    image_format = thumbnail_format(image.name)
+    webp_name = variant_name(image.name, None, WEBP)
+    if webp_name != image.name:
+        save_variant(storage, webp_name, original, WEBP, force)
+    for variant_width in variant_widths(width):
+        picture = original.copy()
+        picture.thumbnail((variant_width, height))
+        save_variant(
+            storage, variant_name(image.name, variant_width),
+            picture, image_format, force
+        )
+        save_variant(
+            storage, variant_name(image.name, variant_width, WEBP),
+            picture, WEBP, force
+        )
+    return width, height
+
+
+def delete_variants(storage, name):
+    """Удаляет копии изображения; сам оригинал остаётся."""
+    for variant in all_variant_names(name):
+        storage.delete(variant)
@@ -0,0 +1,50 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from blog.constants import SITEMAP_CHUNK_SIZE, SITEMAP_LIMIT
+from blog.sitemaps import build_sitemaps
+
+
+class Command(BaseCommand):
+    help = (
+        'Записывает sitemap публикаций, категорий и профилей в'
+        ' SITEMAP_ROOT. Перезаписываются только файлы, в которых'
+        ' изменились видимые публикации.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--root',
+            default=settings.SITEMAP_ROOT,
+            help='Каталог для файлов sitemap.',
+        )
+        parser.add_argument(
+            '--base-url',
+            default=settings.SITEMAP_BASE_URL,
+            help='Адрес сайта, с которого начинаются ссылки.',
+        )
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=SITEMAP_LIMIT,
+            help='Наибольшее количество адресов в одном файле.',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=SITEMAP_CHUNK_SIZE,
+            help='Количество строк, читаемых из базы за один раз.',
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Перезаписать все файлы.',
+        )
+
+    def handle(self, *args, root, base_url, limit, chunk_size, force,
+               **options):
+        result = build_sitemaps(root, base_url, limit, chunk_size, force)
+        self.stdout.write(self.style.SUCCESS(
+            f'Файлов sitemap: {result.files}, перезаписано:'
+            f' {result.written}, удалено: {result.removed}'
+        ))
@@ -0,0 +1,83 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.core.serializers.base import DeserializationError
+from django.db import DEFAULT_DB_ALIAS, DatabaseError
+
+from blog.bulk_load import BulkLoader, iter_json_array, iter_json_lines
+from blog.constants import BULK_LOAD_BATCH_SIZE
+
+JSON_LINES_SUFFIXES = ('.jsonl', '.ndjson')
+
+
+class Command(BaseCommand):
+    help = (
+        'Быстро загружает пользователей, категории, местоположения,'
+        ' публикации и комментарии из фикстуры JSON или файла JSON Lines.'
+        ' Остальные модели пропускаются, связи многие-ко-многим не'
+        ' загружаются. Объекты с существующими ключами не обновляются:'
+        ' для них используйте loaddata.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Путь к файлу с данными.')
+        parser.add_argument(
+            '--format',
+            dest='data_format',
+            choices=('json', 'jsonl'),
+            help='Формат файла; по умолчанию определяется по расширению.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=BULK_LOAD_BATCH_SIZE,
+            help='Количество объектов, вставляемых в одной транзакции.',
+        )
+        parser.add_argument(
+            '--database',
+            default=DEFAULT_DB_ALIAS,
+            help='База данных, в которую загружаются объекты.',
+        )
+
+    def report(self, loader):
+        self.stdout.write(
+            f'Загружено объектов: {loader.total}'
+            f' ({loader.rate:.0f} в секунду)'
+        )
+
+    def handle(self, *args, path, data_format, batch_size, database,
+               **options):
+        if data_format is None:
+            data_format = (
+                'jsonl' if path.endswith(JSON_LINES_SUFFIXES) else 'json'
+            )
+        loader = BulkLoader(database, batch_size, self.report)
+        try:
+            with open(path, encoding='utf-8') as file:
+                objects = (
+                    iter_json_lines(file) if data_format == 'jsonl'
+                    else iter_json_array(file)
+                )
+                for data in objects:
+                    loader.add(data)
+                loader.finish()
+        except (
+            OSError, ValueError, DatabaseError, DeserializationError
+        ) as error:
+            if loader.post_pks or loader.full_refresh:
+                loader.refresh()
+            raise CommandError(
+                f'Загрузка прервана после {loader.total} объектов: {error}'
+            )
+        for label, count in sorted(loader.skipped.items()):
+            self.stdout.write(f'Пропущено {label}: {count}')
+        if loader.ignored_relations:
+            self.stderr.write(
+                'Связи многие-ко-многим не загружены у объектов:'
+                f' {loader.ignored_relations}'
+            )
+        self.stdout.write(self.style.SUCCESS(
+            ', '.join(
+                f'{label}: {count}' for label, count in loader.loaded.items()
+            )
+            + f'. Всего {loader.total} объектов,'
+            f' {loader.rate:.0f} в секунду'
+        ))
@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils.timezone import now
+
+from blog.models import Post, make_excerpt
+
+
+class Command(BaseCommand):
+    help = 'Заполняет начало текста у публикаций.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Количество публикаций, обновляемых за один запрос.',
+        )
+
+    def handle(self, *args, batch_size, **options):
+        last_pk = 0
+        updated = 0
+        while True:
+            batch = list(
+                Post.objects.filter(pk__gt=last_pk)
+                .order_by('pk')
+                .only('id', 'text', 'excerpt', 'updated_at')[:batch_size]
+            )
+            if not batch:
+                break
+            changed = []
+            for post in batch:
+                excerpt = make_excerpt(post.text)
+                if post.excerpt != excerpt:
+                    post.excerpt = excerpt
+                    post.updated_at = now()
+                    changed.append(post)
+            with transaction.atomic():
+                Post.objects.bulk_update(changed, ['excerpt', 'updated_at'])
+            last_pk = batch[-1].pk
+            updated += len(changed)
+        self.stdout.write(
+            self.style.SUCCESS(f'Обновлено публикаций: {updated}')
+        )
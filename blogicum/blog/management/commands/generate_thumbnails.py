@@ -0,0 +1,54 @@
+from django.core.management.base import BaseCommand
+from django.utils.timezone import now
+
+from blog.cache import invalidate_tags
+from blog.images import generate_variants
+from blog.models import Post
+
+
+class Command(BaseCommand):
+    help = 'Создаёт уменьшенные копии изображений публикаций.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Пересоздать уже существующие копии.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Количество публикаций, читаемых из базы за один запрос.',
+        )
+
+    def handle(self, *args, force, batch_size, **options):
+        posts = Post.objects.exclude(image='').only('id', 'image')
+        if not force:
+            posts = posts.filter(image_size__isnull=True)
+        processed = failed = last_pk = 0
+        while True:
+            batch = list(
+                posts.filter(pk__gt=last_pk).order_by('pk')[:batch_size]
+            )
+            if not batch:
+                break
+            last_pk = batch[-1].pk
+            tags = []
+            for post in batch:
+                try:
+                    width, height = generate_variants(post.image, force)
+                except OSError as error:
+                    failed += 1
+                    self.stderr.write(f'{post.image.name}: {error}')
+                    continue
+                Post.objects.filter(pk=post.pk).update(
+                    image_size={'width': width, 'height': height},
+                    updated_at=now(),
+                )
+                tags.append(f'post:{post.pk}')
+                processed += 1
+            invalidate_tags(*tags)
+        self.stdout.write(self.style.SUCCESS(
+            f'Обработано изображений: {processed}, с ошибками: {failed}'
+        ))
@@ -0,0 +1,68 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+from blog.search import FTS_TABLE, fts_enabled
+
+
+class Command(BaseCommand):
+    help = (
+        'Перестраивает полнотекстовый индекс публикаций. Строки индекса'
+        ' заменяются диапазонами ключа, каждый в своей транзакции, поэтому'
+        ' поиск работает и во время перестройки.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=5000,
+            help='Количество публикаций, индексируемых за одну транзакцию.',
+        )
+        parser.add_argument(
+            '--database',
+            default=DEFAULT_DB_ALIAS,
+            help='База данных, индекс которой нужно перестроить.',
+        )
+
+    def handle(self, *args, batch_size, database, **options):
+        if not fts_enabled(database):
+            raise CommandError(
+                'Полнотекстовый индекс поддерживается только для SQLite.'
+            )
+        connection = connections[database]
+        with connection.cursor() as cursor:
+            last_pk = indexed = 0
+            while True:
+                with transaction.atomic(using=database):
+                    cursor.execute(
+                        'SELECT MAX(id) FROM (SELECT id FROM blog_post'
+                        ' WHERE id > %s ORDER BY id LIMIT %s)',
+                        [last_pk, batch_size],
+                    )
+                    upper_pk = cursor.fetchone()[0]
+                    if upper_pk is None:
+                        cursor.execute(
+                            f'DELETE FROM {FTS_TABLE} WHERE rowid > %s',
+                            [last_pk],
+                        )
+                        break
+                    cursor.execute(
+                        f'DELETE FROM {FTS_TABLE}'
+                        ' WHERE rowid > %s AND rowid <= %s',
+                        [last_pk, upper_pk],
+                    )
+                    cursor.execute(
+                        f'INSERT INTO {FTS_TABLE} (rowid, title, text)'
+                        ' SELECT id, title, text FROM blog_post'
+                        ' WHERE id > %s AND id <= %s',
+                        [last_pk, upper_pk],
+                    )
+                    indexed += cursor.rowcount
+                last_pk = upper_pk
+                self.stdout.write(f'Проиндексировано публикаций: {indexed}')
+            cursor.execute(
+                f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}) VALUES ('optimize')"
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f'Индекс перестроен, публикаций: {indexed}'
+        ))
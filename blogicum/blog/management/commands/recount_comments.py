@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils.timezone import now
+
+from blog.comment_counts import comment_count_subquery
+from blog.models import Post
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает количество комментариев у публикаций.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Количество публикаций, обновляемых за один запрос.',
+        )
+
+    def handle(self, *args, batch_size, **options):
+        last_pk = 0
+        updated = 0
+        while True:
+            batch = list(
+                Post.objects.filter(pk__gt=last_pk)
+                .order_by('pk')
+                .values_list('pk', flat=True)[:batch_size]
+            )
+            if not batch:
+                break
+            with transaction.atomic():
+                Post.objects.filter(
+                    pk__gte=batch[0], pk__lte=batch[-1]
+                ).update(
+                    comment_count=comment_count_subquery(),
+                    updated_at=now(),
+                )
+            last_pk = batch[-1]
+            updated += len(batch)
+        self.stdout.write(
+            self.style.SUCCESS(f'Обновлено публикаций: {updated}')
+        )
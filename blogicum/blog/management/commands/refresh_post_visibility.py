@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from blog.constants import VISIBILITY_BATCH_SIZE
+from blog.models import Post
+from blog.visibility import refresh_visibility, set_posts_visibility
+
+
+class Command(BaseCommand):
+    help = (
+        'Сверяет флаг видимости публикаций и сдвигает границу'
+        ' отложенных публикаций. Рассчитана на периодический запуск.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=VISIBILITY_BATCH_SIZE,
+            help='Количество публикаций, обновляемых за один запрос.',
+        )
+
+    def handle(self, *args, batch_size, **options):
+        hidden = set_posts_visibility(
+            Post.objects.exclude(
+                Q(is_published=True) & Q(category__is_published=True)
+            ),
+            False,
+            batch_size,
+        )
+        shown = set_posts_visibility(Post.objects.all(), True, batch_size)
+        frontier = refresh_visibility()
+        self.stdout.write(self.style.SUCCESS(
+            f'Скрыто: {hidden}, показано: {shown},'
+            f' граница видимости: {frontier:%Y-%m-%d %H:%M:%S}'
+        ))
@@ -0,0 +1,18 @@
+# Generated by Django 3.2.16 on 2026-10-18 18:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0012_feed_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='image_size',
+            field=models.JSONField(blank=True, editable=False, null=True, verbose_name='Размер фото'),
+        ),
+    ]
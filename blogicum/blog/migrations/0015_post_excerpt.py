@@ -0,0 +1,42 @@
+# Generated by Django 3.2.16 on 2026-10-18 18:44
+
+from django.db import migrations, models
+from django.utils.text import Truncator
+
+
+BATCH_SIZE = 500
+
+
+def fill_excerpt(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    last_pk = 0
+    while True:
+        posts = list(
+            Post.objects.filter(pk__gt=last_pk)
+            .order_by('pk')
+            .only('id', 'text')[:BATCH_SIZE]
+        )
+        if not posts:
+            break
+        for post in posts:
+            post.excerpt = Truncator(
+                Truncator(post.text).words(10, truncate=' …')
+            ).chars(256)
+        Post.objects.bulk_update(posts, ['excerpt'])
+        last_pk = posts[-1].pk
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0014_post_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='excerpt',
+            field=models.CharField(blank=True, default='', editable=False, max_length=256, verbose_name='Начало текста'),
+        ),
+        migrations.RunPython(fill_excerpt, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 3.2.16 on 2026-10-18 21:40
+
+from django.db import migrations
+
+
+def reset_image_size(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    Post.objects.exclude(image='').update(image_size=None)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0018_post_updated_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(reset_image_size, migrations.RunPython.noop),
+    ]
@@ -1,13 +1,55 @@
+import hashlib
+from functools import wraps
+from http import HTTPStatus
+
 from django.shortcuts import redirect, reverse
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
+from django.http import Http404
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+
+from blogicum.routers import read_from_primary
 
+from .cache import (
+    VISIBILITY_TAG, get_cached_page, get_tag_versions, page_key, post_tags,
+    store_page
+)
+from .comment_counts import annotate_comment_count, fill_comment_counts
+from .constants import COMMENT_COUNT_STRATEGY, CURSOR_PAGINATION
 from .forms import CommentForm, PostForm
 from .models import Post, Comment
+from .paginator import CursorPaginator, InvalidCursor
+from .visibility import visibility_cutoff
+
+
+def memoize_lookup(method):
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if args or kwargs:
+            return method(self, *args, **kwargs)
+        lookups = self.__dict__.setdefault('_lookups', {})
+        if method.__name__ not in lookups:
+            lookups[method.__name__] = method(self)
+        return lookups[method.__name__]
+    return wrapper
+
+
+def not_modified(request, etag):
+    response = get_conditional_response(request, etag=etag)
+    if response is not None:
+        response['ETag'] = etag
+    return response
 
 
-class UserPassesMixin(UserPassesTestMixin):
+class LookupCacheMixin:
+    @memoize_lookup
+    def get_object(self, queryset=None):
+        return super().get_object(queryset)
+
+
+class UserPassesMixin(LookupCacheMixin, UserPassesTestMixin):
     def test_func(self):
-        return self.request.user == self.get_object().author
+        return self.request.user.pk == self.get_object().author_id
 
 
 class PostMixin(UserPassesMixin, LoginRequiredMixin):
@@ -41,3 +83,87 @@ class CommentMixin(LoginRequiredMixin):
             'blog:post_detail',
             kwargs={'post_pk': self.object.post_id}
         )
+
+
+class CursorPaginationMixin:
+    cursor_pagination = CURSOR_PAGINATION
+
+    def paginate_queryset(self, queryset, page_size):
+        if not self.cursor_pagination:
+            return super().paginate_queryset(queryset, page_size)
+        paginator = CursorPaginator(queryset, page_size)
+        try:
+            page = paginator.page(
+                after=self.request.GET.get('after'),
+                before=self.request.GET.get('before'),
+            )
+        except InvalidCursor as error:
+            raise Http404(error)
+        return paginator, page, page.object_list, page.has_other_pages()
+
+
+class CommentCountMixin:
+    comment_count_strategy = COMMENT_COUNT_STRATEGY
+
+    def paginate_queryset(self, queryset, page_size):
+        paginator, page, object_list, is_paginated = (
+            super().paginate_queryset(
+                annotate_comment_count(queryset, self.comment_count_strategy),
+                page_size
+            )
+        )
+        page.object_list = list(page.object_list)
+        fill_comment_counts(page.object_list, self.comment_count_strategy)
+        return paginator, page, page.object_list, is_paginated
+
+
+class ConditionalGetMixin:
+    """Отвечает 304 Not Modified, не выполняя запросы ленты и шаблоны.
+
+    ETag строится из `get_etag_parts()` и текущего пользователя; части
+    должны дёшево вычисляться и меняться при любом изменении страницы.
+    """
+
+    def get_etag_parts(self):
+        return []
+
+    def get_etag(self):
+        parts = repr([self.request.user.pk, *self.get_etag_parts()])
+        return quote_etag(hashlib.md5(parts.encode()).hexdigest())
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            return super().dispatch(request, *args, **kwargs)
+        etag = self.get_etag()
+        response = not_modified(request, etag)
+        if response is None:
+            response = super().dispatch(request, *args, **kwargs)
+            if response.status_code == HTTPStatus.OK:
+                response['ETag'] = etag
+        return response
+
+
+class AnonymousPageCacheMixin:
+    def get_cache_tags(self):
+        return {VISIBILITY_TAG}
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method != 'GET' or request.user.is_authenticated:
+            return super().dispatch(request, *args, **kwargs)
+        visibility_cutoff()
+        key = page_key(request)
+        response = get_cached_page(key)
+        if response is not None:
+            if response.has_header('ETag'):
+                return not_modified(request, response['ETag']) or response
+            return response
+        read_from_primary()
+        versions = get_tag_versions(self.get_cache_tags())
+        response = super().dispatch(request, *args, **kwargs)
+        if response.status_code == HTTPStatus.OK:
+            page = response.context_data['page_obj']
+            versions.update(get_tag_versions(post_tags(page.object_list)))
+            response.add_post_render_callback(
+                lambda rendered: store_page(key, rendered, versions)
+            )
+        return response
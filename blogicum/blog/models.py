@@ -1,11 +1,19 @@
 from django.contrib.auth import get_user_model
 from django.db import models
+from django.utils.text import Truncator
 
-from .constants import SIZE_CUT_TITLE, MAX_LENGTH
+from .constants import EXCERPT_WORDS, SIZE_CUT_TITLE, MAX_LENGTH
+from .images import build_srcset, smallest_variant_url
 
 User = get_user_model()
 
 
+def make_excerpt(text):
+    return Truncator(
+        Truncator(text).words(EXCERPT_WORDS, truncate=' …')
+    ).chars(MAX_LENGTH)
+
+
 class CreatedAt(models.Model):
     created_at = models.DateTimeField(
         auto_now_add=True,
@@ -35,6 +43,13 @@ class Post(IsPublishModel):
     )
     text = models.TextField(
         verbose_name='Текст')
+    excerpt = models.CharField(
+        max_length=MAX_LENGTH,
+        default='',
+        blank=True,
+        editable=False,
+        verbose_name='Начало текста'
+    )
     pub_date = models.DateTimeField(
         verbose_name='Дата и время публикации',
         help_text='Если установить дату и время в будущем'
@@ -64,16 +79,108 @@ class Post(IsPublishModel):
         upload_to='posts_images',
         blank=True
     )
+    image_size = models.JSONField(
+        null=True,
+        blank=True,
+        editable=False,
+        verbose_name='Размер фото'
+    )
+    comment_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество комментариев'
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Изменено'
+    )
+    is_visible = models.BooleanField(
+        default=False,
+        editable=False,
+        verbose_name='Видна в ленте',
+        help_text='Публикация и её категория опубликованы.'
+    )
 
     class Meta:
         default_related_name = 'posts'
         verbose_name_plural = 'Публикации'
         verbose_name = 'публикация'
         ordering = ('-pub_date',)
+        indexes = (
+            models.Index(
+                fields=('-pub_date', '-id'),
+                name='post_feed_idx',
+                condition=models.Q(is_visible=True)
+            ),
+            models.Index(
+                fields=('category', '-pub_date', '-id'),
+                name='post_category_feed_idx',
+                condition=models.Q(is_visible=True)
+            ),
+            models.Index(
+                fields=('author', '-pub_date', '-id'),
+                name='post_author_feed_idx'
+            ),
+            models.Index(
+                fields=('updated_at',),
+                name='post_updated_idx',
+                condition=models.Q(is_visible=True)
+            ),
+            models.Index(
+                fields=('category', 'updated_at'),
+                name='post_category_updated_idx',
+                condition=models.Q(is_visible=True)
+            ),
+            models.Index(
+                fields=('author', 'updated_at'),
+                name='post_author_updated_idx'
+            ),
+        )
 
     def __str__(self):
         return self.title[:SIZE_CUT_TITLE]
 
+    def save(self, *args, **kwargs):
+        deferred = self.get_deferred_fields()
+        sources = {}
+        if 'text' not in deferred:
+            self.excerpt = make_excerpt(self.text)
+            sources['excerpt'] = {'text'}
+        if not {'is_published', 'category_id'} & deferred:
+            self.is_visible = bool(
+                self.is_published
+                and self.category_id
+                and self.category.is_published
+            )
+            sources['is_visible'] = {'is_published', 'category', 'category_id'}
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = {*update_fields, 'updated_at', *(
+                field for field, fields in sources.items()
+                if fields & set(update_fields)
+            )}
+        super().save(*args, **kwargs)
+
+    @property
+    def image_width(self):
+        return (self.image_size or {}).get('width')
+
+    @property
+    def image_height(self):
+        return (self.image_size or {}).get('height')
+
+    @property
+    def image_srcset(self):
+        return build_srcset(self.image, self.image_width)
+
+    @property
+    def image_webp_srcset(self):
+        return build_srcset(self.image, self.image_width, webp=True)
+
+    @property
+    def thumbnail_url(self):
+        return smallest_variant_url(self.image, self.image_width)
+
 
 class Category(IsPublishModel):
     title = models.CharField(
@@ -133,6 +240,12 @@ class Comment(CreatedAt):
         default_related_name = 'comments'
         verbose_name_plural = 'Комментарии'
         verbose_name = 'комментарий'
+        indexes = (
+            models.Index(
+                fields=('post', 'created_at'),
+                name='comment_post_created_idx'
+            ),
+        )
 
     def __str__(self):
         return self.text[:SIZE_CUT_TITLE]
@@ -0,0 +1,189 @@
+import base64
+import binascii
+
+from django.core.paginator import EmptyPage, Page, Paginator
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from django.utils.functional import cached_property
+
+from .constants import PAGINATION_MAX_COUNT, PAGINATION_WINDOW
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(value, pk):
+    raw = f'{value.isoformat()}|{pk}'.encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    try:
+        raw = base64.urlsafe_b64decode(
+            cursor + '=' * (-len(cursor) % 4)
+        ).decode()
+        value, pk = raw.rsplit('|', 1)
+        value = parse_datetime(value)
+        pk = int(pk)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise InvalidCursor('Неверный курсор страницы')
+    if value is None:
+        raise InvalidCursor('Неверный курсор страницы')
+    return value, pk
+
+
+class CursorPage:
+    is_cursor = True
+    number = None
+
+    def __init__(self, object_list, paginator, has_next, has_previous):
+        self.object_list = object_list
+        self.paginator = paginator
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __repr__(self):
+        return f'<CursorPage of {len(self.object_list)} objects>'
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self._has_next or self._has_previous
+
+    @property
+    def next_cursor(self):
+        if self._has_next and self.object_list:
+            return self.paginator.cursor_for(self.object_list[-1])
+        return None
+
+    @property
+    def previous_cursor(self):
+        if self._has_previous and self.object_list:
+            return self.paginator.cursor_for(self.object_list[0])
+        return None
+
+
+class CursorPaginator:
+    """Постраничный вывод по ключу (field, id) без OFFSET и COUNT(*).
+
+    Записи упорядочены от новых к старым; курсор `after` ведёт к более
+    старым записям, курсор `before` — к более новым.
+    """
+
+    def __init__(self, object_list, per_page, field='pub_date'):
+        self.object_list = object_list
+        self.per_page = int(per_page)
+        self.field = field
+
+    def cursor_for(self, obj):
+        return encode_cursor(getattr(obj, self.field), obj.pk)
+
+    def older_than(self, after=None):
+        queryset = self.object_list.order_by(f'-{self.field}', '-pk')
+        if after:
+            value, pk = decode_cursor(after)
+            queryset = queryset.filter(
+                Q(**{f'{self.field}__lt': value})
+                | Q(**{self.field: value, 'pk__lt': pk})
+            )
+        return queryset
+
+    def page(self, after=None, before=None):
+        if before:
+            value, pk = decode_cursor(before)
+            queryset = self.object_list.filter(
+                Q(**{f'{self.field}__gt': value})
+                | Q(**{self.field: value, 'pk__gt': pk})
+            ).order_by(self.field, 'pk')
+            items = list(queryset[:self.per_page + 1])
+            has_previous = len(items) > self.per_page
+            items = items[:self.per_page][::-1]
+            return CursorPage(items, self, True, has_previous)
+
+        items = list(self.older_than(after)[:self.per_page + 1])
+        has_next = len(items) > self.per_page
+        return CursorPage(
+            items[:self.per_page], self, has_next, bool(after)
+        )
+
+
+class WindowPage(Page):
+    has_more = None
+
+    def has_next(self):
+        if self.has_more is None:
+            return super().has_next()
+        return self.has_more
+
+    @cached_property
+    def page_range(self):
+        if self.has_more is None:
+            return list(self.paginator.get_elided_page_range(
+                self.number, on_each_side=PAGINATION_WINDOW, on_ends=1
+            ))
+        start = max(1, self.number - PAGINATION_WINDOW)
+        return [
+            *[1, self.paginator.ELLIPSIS][:max(start - 1, 0)],
+            *range(start, self.number + 1),
+            *([self.number + 1] if self.has_more else []),
+        ]
+
+
+class WindowPaginator(Paginator):
+    """Постраничный вывод с окном ссылок вокруг текущей страницы.
+
+    Количество записей считается не дальше max_count: для больших
+    выборок `count` равен max_count, а `count_capped` — True. Страницы
+    начиная с последней посчитанной читаются с одной лишней записью,
+    по которой видно, есть ли следующая страница.
+    """
+
+    max_count = PAGINATION_MAX_COUNT
+    count_capped = False
+
+    def _get_page(self, *args, **kwargs):
+        return WindowPage(*args, **kwargs)
+
+    @cached_property
+    def count(self):
+        if not hasattr(self.object_list, 'query'):
+            return len(self.object_list)
+        count = self.object_list.order_by().values('pk')[
+            :self.max_count + 1
+        ].count()
+        self.count_capped = count > self.max_count
+        return min(count, self.max_count)
+
+    def validate_number(self, number):
+        try:
+            return super().validate_number(number)
+        except EmptyPage:
+            if not self.count_capped or int(number) < 1:
+                raise
+            return int(number)
+
+    def page(self, number):
+        number = self.validate_number(number)
+        if not self.count_capped or number < self.num_pages:
+            return super().page(number)
+        bottom = (number - 1) * self.per_page
+        items = list(self.object_list[bottom:bottom + self.per_page + 1])
+        if not items:
+            raise EmptyPage('На этой странице нет записей')
+        page = self._get_page(items[:self.per_page], number, self)
+        page.has_more = len(items) > self.per_page
+        return page
@@ -0,0 +1,100 @@
+"""Полнотекстовый поиск по публикациям на основе SQLite FTS5.
+
+Индекс хранится в виртуальной таблице FTS_TABLE, строка которой имеет
+тот же rowid, что и публикация. Индекс обновляется сигналами модели
+`Post`; команда `rebuild_search_index` перестраивает его целиком.
+"""
+import re
+
+from django.db import connections
+from django.db.models import Q
+
+FTS_TABLE = 'blog_post_fts'
+MARK_START = '\x02'
+MARK_END = '\x03'
+SNIPPET_TOKENS = 16
+
+
+def fts_enabled(using):
+    return connections[using].vendor == 'sqlite'
+
+
+def build_match_query(query):
+    terms = re.findall(r'\w+', query)
+    return ' '.join(f'"{term}"*' for term in terms)
+
+
+def index_post(post, using):
+    if not fts_enabled(using):
+        return
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [post.pk]
+        )
+        cursor.execute(
+            f'INSERT INTO {FTS_TABLE} (rowid, title, text)'
+            ' VALUES (%s, %s, %s)',
+            [post.pk, post.title, post.text],
+        )
+
+
+def index_posts(post_pks, using):
+    if not fts_enabled(using):
+        return
+    connection = connections[using]
+    size = connection.features.max_query_params or len(post_pks)
+    with connection.cursor() as cursor:
+        for start in range(0, len(post_pks), size):
+            batch = post_pks[start:start + size]
+            placeholders = ', '.join(['%s'] * len(batch))
+            cursor.execute(
+                f'DELETE FROM {FTS_TABLE} WHERE rowid IN ({placeholders})',
+                batch,
+            )
+            cursor.execute(
+                f'INSERT INTO {FTS_TABLE} (rowid, title, text)'
+                ' SELECT id, title, text FROM blog_post'
+                f' WHERE id IN ({placeholders})',
+                batch,
+            )
+
+
+def unindex_post(post_pk, using):
+    if not fts_enabled(using):
+        return
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [post_pk]
+        )
+
+
+def search_posts(queryset, query, snippets=True):
+    """Отбирает публикации по запросу и упорядочивает их по релевантности.
+
+    У найденных публикаций появляются атрибуты `search_rank` и,
+    если snippets=True, `search_snippet` с отмеченными совпадениями.
+    """
+    match = build_match_query(query)
+    if not match:
+        return queryset.none()
+    if not fts_enabled(queryset.db):
+        return queryset.filter(
+            Q(title__icontains=query) | Q(text__icontains=query)
+        )
+    select = {'search_rank': f'bm25({FTS_TABLE}, 10.0, 1.0)'}
+    select_params = ()
+    if snippets:
+        select['search_snippet'] = (
+            f"snippet({FTS_TABLE}, 1, %s, %s, '…', {SNIPPET_TOKENS})"
+        )
+        select_params = (MARK_START, MARK_END)
+    return queryset.extra(
+        select=select,
+        select_params=select_params,
+        tables=[FTS_TABLE],
+        where=[
+            f'{FTS_TABLE}.rowid = blog_post.id',
+            f'{FTS_TABLE} MATCH %s',
+        ],
+        params=[match],
+    ).order_by('search_rank', '-pub_date')
@@ -0,0 +1,231 @@
+from django.contrib.auth import get_user_model
+from django.db.models import DEFERRED, F, Q
+from django.db.models.signals import (
+    post_delete, post_init, post_save, pre_delete, pre_save
+)
+from django.dispatch import receiver
+from django.utils.timezone import now
+
+from .cache import invalidate_tags
+from .images import delete_variants, generate_variants
+from .models import Category, Comment, Location, Post, make_excerpt
+from .search import index_post, unindex_post
+from .constants import VISIBILITY_BATCH_SIZE
+from .visibility import (
+    refresh_visibility, schedule_publication, set_posts_visibility,
+    update_posts
+)
+
+User = get_user_model()
+
+POST_TRACKED_FIELDS = (
+    'category_id', 'author_id', 'image', 'title', 'text'
+)
+CATEGORY_TRACKED_FIELDS = ('title', 'slug', 'is_published')
+CATEGORY_CARD_FIELDS = ('title', 'slug')
+
+
+def change_comment_count(post_id, delta):
+    if post_id is None:
+        return
+    posts = Post.objects.filter(pk=post_id)
+    if delta < 0:
+        posts = posts.filter(comment_count__gte=-delta)
+    posts.update(comment_count=F('comment_count') + delta, updated_at=now())
+
+
+def touch_posts(*args, **filters):
+    update_posts(Post.objects.filter(*args, **filters))
+
+
+def update_post_pks(pks, **values):
+    for start in range(0, len(pks), VISIBILITY_BATCH_SIZE):
+        Post.objects.filter(
+            pk__in=pks[start:start + VISIBILITY_BATCH_SIZE]
+        ).update(updated_at=now(), **values)
+
+
+def delete_unused_variants(image, name):
+    if name and not Post.objects.filter(image=name).exists():
+        delete_variants(image.storage, name)
+
+
+def remember_fields(instance, *fields):
+    instance._saved_fields = {
+        field: instance.__dict__.get(field, DEFERRED) for field in fields
+    }
+
+
+def related_tags(instance, **prefixes):
+    tags = set()
+    for prefix, field in prefixes.items():
+        for value in (
+            getattr(instance, f'{field}_id'),
+            instance._saved_fields.get(f'{field}_id'),
+        ):
+            if value not in (None, DEFERRED):
+                tags.add(f'{prefix}:{value}')
+    return tags
+
+
+@receiver(post_init, sender=Comment)
+def remember_comment_post(sender, instance, **kwargs):
+    remember_fields(instance, 'post_id')
+
+
+@receiver(post_save, sender=Comment)
+def count_saved_comment(sender, instance, created, **kwargs):
+    saved_post_id = instance._saved_fields['post_id']
+    if created:
+        change_comment_count(instance.post_id, 1)
+    elif saved_post_id not in (DEFERRED, instance.post_id):
+        change_comment_count(saved_post_id, -1)
+        change_comment_count(instance.post_id, 1)
+    invalidate_tags(*related_tags(instance, post='post'))
+    remember_fields(instance, 'post_id')
+
+
+@receiver(post_delete, sender=Comment)
+def count_deleted_comment(sender, instance, **kwargs):
+    change_comment_count(instance.post_id, -1)
+    invalidate_tags(*related_tags(instance, post='post'))
+
+
+@receiver(post_init, sender=Post)
+def remember_post_relations(sender, instance, **kwargs):
+    remember_fields(instance, *POST_TRACKED_FIELDS)
+
+
+@receiver(pre_save, sender=Post)
+def fill_loaded_post(sender, instance, raw, using, **kwargs):
+    """Заполняет поля, которые при загрузке фикстур не считает save()."""
+    if instance.updated_at is None:
+        instance.updated_at = now()
+    if not raw:
+        return
+    instance.excerpt = make_excerpt(instance.text)
+    instance.is_visible = bool(
+        instance.is_published
+        and Category.objects.using(using).filter(
+            pk=instance.category_id, is_published=True
+        ).exists()
+    )
+
+
+@receiver(post_save, sender=Post)
+def generate_post_thumbnails(sender, instance, **kwargs):
+    saved_image = instance._saved_fields['image']
+    saved_name = getattr(saved_image, 'name', saved_image)
+    image_changed = saved_image is not DEFERRED and (
+        saved_name != instance.image.name
+    )
+    if image_changed:
+        delete_unused_variants(instance.image, saved_name)
+    elif instance.image_size or not instance.image:
+        return
+    image_size = None
+    if instance.image:
+        try:
+            width, height = generate_variants(instance.image)
+            image_size = {'width': width, 'height': height}
+        except OSError:
+            pass
+    instance.updated_at = now()
+    Post.objects.filter(pk=instance.pk).update(
+        image_size=image_size, updated_at=instance.updated_at
+    )
+    instance.image_size = image_size
+
+
+@receiver(post_save, sender=Post)
+def index_saved_post(sender, instance, created, using, **kwargs):
+    saved = instance._saved_fields
+    if created or (saved['title'], saved['text']) != (
+        instance.title, instance.text
+    ):
+        index_post(instance, using)
+
+
+@receiver(post_delete, sender=Post)
+def unindex_deleted_post(sender, instance, using, **kwargs):
+    unindex_post(instance.pk, using)
+
+
+@receiver(post_delete, sender=Post)
+def delete_post_thumbnails(sender, instance, **kwargs):
+    delete_unused_variants(instance.image, instance.image.name)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def invalidate_post_pages(sender, instance, **kwargs):
+    invalidate_tags(
+        'feed',
+        f'post:{instance.pk}',
+        *related_tags(
+            instance, **{'feed:category': 'category', 'feed:user': 'author'}
+        ),
+    )
+    remember_fields(instance, *POST_TRACKED_FIELDS)
+
+
+@receiver(post_save, sender=Post)
+def schedule_post(sender, instance, **kwargs):
+    if instance.is_visible:
+        schedule_publication(instance.pub_date)
+
+
+@receiver(post_init, sender=Category)
+def remember_category_state(sender, instance, **kwargs):
+    remember_fields(instance, *CATEGORY_TRACKED_FIELDS)
+
+
+@receiver(pre_delete, sender=Category)
+@receiver(pre_delete, sender=Location)
+def remember_related_posts(sender, instance, **kwargs):
+    instance._post_pks = list(
+        instance.posts.order_by('pk').values_list('pk', flat=True)
+    )
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_category_pages(sender, instance, **kwargs):
+    if kwargs['signal'] is post_delete:
+        update_post_pks(instance._post_pks, is_visible=False)
+        refresh_visibility()
+    else:
+        saved = instance._saved_fields
+        if (
+            kwargs['raw']
+            or saved['is_published'] != instance.is_published
+        ):
+            set_posts_visibility(instance.posts.all(), instance.is_published)
+            refresh_visibility()
+        if any(
+            saved[field] != getattr(instance, field)
+            for field in CATEGORY_CARD_FIELDS
+        ):
+            touch_posts(category=instance)
+    invalidate_tags(f'category:{instance.pk}')
+    remember_fields(instance, *CATEGORY_TRACKED_FIELDS)
+
+
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def invalidate_location_pages(sender, instance, **kwargs):
+    if kwargs['signal'] is post_delete:
+        update_post_pks(instance._post_pks)
+    else:
+        touch_posts(location=instance)
+    invalidate_tags(f'location:{instance.pk}')
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_pages(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        return
+    if kwargs['signal'] is post_save:
+        touch_posts(Q(author=instance) | Q(comments__author=instance))
+    invalidate_tags(f'user:{instance.pk}')
@@ -0,0 +1,146 @@
+"""Файлы sitemap публикаций, категорий и профилей авторов.
+
+Раздел разбит на файлы по диапазонам ключа шириной SITEMAP_LIMIT: в
+файле не больше SITEMAP_LIMIT адресов, а границы файлов не сдвигаются
+при удалении записей. Для каждого файла в STATE_NAME хранится отпечаток
+видимых публикаций диапазона, и при повторном запуске перезаписываются
+только файлы, отпечаток которых изменился. Команда `build_sitemaps`
+пишет файлы в SITEMAP_ROOT, откуда их отдаёт веб-сервер.
+"""
+import json
+import os
+from collections import namedtuple
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+from django.db.models import (
+    BigIntegerField, Count, ExpressionWrapper, F, Max, Sum
+)
+from django.urls import reverse
+
+from .constants import SITEMAP_CHUNK_SIZE, SITEMAP_LIMIT
+from .models import Post
+from .views import filter_posts_by_date
+
+SITEMAP_NS = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+XML_HEADER = '<?xml version="1.0" encoding="UTF-8"?>\n'
+INDEX_NAME = 'sitemap.xml'
+STATE_NAME = 'sitemap-state.json'
+
+Section = namedtuple('Section', ('name', 'key', 'field', 'url_name'))
+
+SECTIONS = (
+    Section('posts', 'id', 'id', 'blog:post_detail'),
+    Section(
+        'categories', 'category_id', 'category__slug', 'blog:category_posts'
+    ),
+    Section('profiles', 'author_id', 'author__username', 'profile'),
+)
+
+BuildResult = namedtuple('BuildResult', ('files', 'written', 'removed'))
+
+
+def section_signatures(section, limit):
+    rows = filter_posts_by_date(Post.objects.all()).annotate(
+        bucket=ExpressionWrapper(
+            F(section.key) / limit, output_field=BigIntegerField()
+        )
+    ).values('bucket').annotate(
+        count=Count('id'), keys=Sum(section.key), lastmod=Max('updated_at')
+    ).order_by('bucket')
+    return {
+        f'sitemap-{section.name}-{row["bucket"]}.xml': (
+            row['bucket'],
+            [row['count'], row['keys'], row['lastmod'].isoformat()],
+        )
+        for row in rows
+    }
+
+
+def section_rows(section, bucket, limit, chunk_size):
+    return filter_posts_by_date(Post.objects.all()).filter(**{
+        f'{section.key}__gte': bucket * limit,
+        f'{section.key}__lt': (bucket + 1) * limit,
+    }).values_list(section.field).annotate(
+        lastmod=Max('updated_at')
+    ).order_by(section.key).iterator(chunk_size=chunk_size)
+
+
+def urlset_lines(base_url, section, rows):
+    yield XML_HEADER
+    yield f'<urlset xmlns="{SITEMAP_NS}">\n'
+    for value, lastmod in rows:
+        location = escape(base_url + reverse(section.url_name, args=[value]))
+        yield (
+            f'<url><loc>{location}</loc>'
+            f'<lastmod>{lastmod.isoformat()}</lastmod></url>\n'
+        )
+    yield '</urlset>\n'
+
+
+def index_lines(base_url, files):
+    yield XML_HEADER
+    yield f'<sitemapindex xmlns="{SITEMAP_NS}">\n'
+    for name, entry in files.items():
+        yield (
+            f'<sitemap><loc>{escape(f"{base_url}/{name}")}</loc>'
+            f'<lastmod>{entry["signature"][2]}</lastmod></sitemap>\n'
+        )
+    yield '</sitemapindex>\n'
+
+
+def write_atomic(path, lines):
+    temporary = path.with_name(f'.{path.name}.tmp')
+    with open(temporary, 'w', encoding='utf-8') as file:
+        file.writelines(lines)
+    os.replace(temporary, path)
+
+
+def load_state(path, base_url, limit):
+    try:
+        state = json.loads(path.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+    if (state.get('base_url'), state.get('limit')) != (base_url, limit):
+        return {}
+    return state.get('files', {})
+
+
+def build_sitemaps(
+    root, base_url, limit=SITEMAP_LIMIT, chunk_size=SITEMAP_CHUNK_SIZE,
+    force=False
+):
+    """Перезаписывает изменившиеся файлы sitemap и индекс sitemap.xml.
+
+    Старые файлы диапазонов, в которых не осталось видимых публикаций,
+    удаляются. При force=True все файлы пишутся заново.
+    """
+    root = Path(root)
+    root.mkdir(parents=True, exist_ok=True)
+    base_url = base_url.rstrip('/')
+    state_path = root / STATE_NAME
+    previous = {} if force else load_state(state_path, base_url, limit)
+    files = {}
+    written = 0
+    for section in SECTIONS:
+        signatures = section_signatures(section, limit)
+        for name, (bucket, signature) in signatures.items():
+            files[name] = {'signature': signature}
+            if (
+                previous.get(name) == files[name]
+                and (root / name).exists()
+            ):
+                continue
+            write_atomic(root / name, urlset_lines(
+                base_url, section,
+                section_rows(section, bucket, limit, chunk_size),
+            ))
+            written += 1
+    removed = set(previous) - set(files)
+    for name in removed:
+        (root / name).unlink(missing_ok=True)
+    write_atomic(root / INDEX_NAME, index_lines(base_url, files))
+    write_atomic(state_path, [json.dumps(
+        {'base_url': base_url, 'limit': limit, 'files': files}, indent=2
+    )])
+    return BuildResult(len(files), written, len(removed))
@@ -0,0 +1,36 @@
+from django import template
+from django.template.loader import render_to_string
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+from blog.cache import card_key, get_cache
+from blog.constants import POST_CARD_TIMEOUT
+from blog.search import MARK_END, MARK_START
+
+register = template.Library()
+
+
+@register.filter
+def highlight(snippet):
+    return mark_safe(
+        escape(snippet)
+        .replace(MARK_START, '<mark>')
+        .replace(MARK_END, '</mark>')
+    )
+
+
+@register.simple_tag(takes_context=True)
+def post_card(context, post):
+    """Карточка публикации, закэшированная по её `updated_at`."""
+    if 'updated_at' not in post.__dict__:
+        return render_to_string('includes/post_card.html', {'post': post})
+    cache = get_cache()
+    key = card_key(post)
+    card = cache.get(key)
+    timings = getattr(context.get('request'), 'timings', None)
+    if timings is not None:
+        timings.record_card(hit=card is not None)
+    if card is None:
+        card = render_to_string('includes/post_card.html', {'post': post})
+        cache.set(key, card, POST_CARD_TIMEOUT)
+    return mark_safe(card)
@@ -1,6 +1,6 @@
 from django.urls import path
 
-from . import views
+from . import feeds, views
 
 app_name = 'blog'
 urlpatterns = [
@@ -28,7 +28,28 @@ urlpatterns = [
     path('posts/<int:post_pk>/delete_comment/<int:comment_pk>',
          views.DeleteCommentView.as_view(),
          name='delete_comment'),
+    path('search/',
+         views.SearchView.as_view(),
+         name='search'),
     path('category/<slug:category>/',
          views.CategoryView.as_view(),
          name='category_posts'),
+    path('rss/',
+         feeds.PostsFeed(),
+         name='feed_rss'),
+    path('atom/',
+         feeds.PostsAtomFeed(),
+         name='feed_atom'),
+    path('category/<slug:category>/rss/',
+         feeds.CategoryPostsFeed(),
+         name='category_feed_rss'),
+    path('category/<slug:category>/atom/',
+         feeds.CategoryPostsAtomFeed(),
+         name='category_feed_atom'),
+    path('profile/<slug:username>/rss/',
+         feeds.AuthorPostsFeed(),
+         name='author_feed_rss'),
+    path('profile/<slug:username>/atom/',
+         feeds.AuthorPostsAtomFeed(),
+         name='author_feed_atom'),
 ]
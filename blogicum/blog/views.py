@@ -1,57 +1,111 @@
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.db.models import Count
+from django.db.models import Max
 from django.http import Http404
 from django.shortcuts import get_object_or_404
 from django.urls import reverse_lazy
-from django.utils.timezone import now
 from django.views.generic import CreateView, DeleteView, ListView, UpdateView
 
-from .constants import PAGINATION
+from .cache import get_tag_versions
+from .constants import (
+    COMMENT_FIELDS, PAGINATION, POST_CARD_FIELDS, POST_SEARCH_FIELDS
+)
 from .forms import CommentForm, PostForm
 from .models import Post, Category
-from .mixin import PostMixin, CommentMixin, UserPassesMixin
+from .paginator import WindowPaginator
+from .mixin import (
+    AnonymousPageCacheMixin, CommentCountMixin, CommentMixin,
+    ConditionalGetMixin, CursorPaginationMixin, PostMixin, UserPassesMixin,
+    memoize_lookup
+)
+from .search import search_posts
+from .visibility import visibility_cutoff
 
 
 def filter_posts_by_date(post_manager):
     return post_manager.filter(
-        pub_date__lte=now(),
-        is_published=True,
-        category__is_published=True,
+        pub_date__lte=visibility_cutoff(),
+        is_visible=True,
     )
 
 
-def annotate_comments(post_manager):
-    return post_manager.select_related(
-        'author',
-        'location',
-        'category'
-    ).annotate(
-        comment_count=Count('comments')
-    ).order_by('-pub_date')
+def only_fields(manager, fields):
+    related = {field.split('__')[0] for field in fields if '__' in field}
+    if related:
+        manager = manager.select_related(*sorted(related))
+    return manager.only(*fields)
 
 
-class IndexView(ListView):
+def annotate_comments(post_manager, fields=POST_CARD_FIELDS):
+    return only_fields(post_manager, fields).order_by('-pub_date', '-id')
+
+
+def get_post_or_404(user, pk, queryset=None):
+    post = get_object_or_404(
+        queryset if queryset is not None else Post.objects.select_related(
+            'author', 'location', 'category'
+        ),
+        pk=pk
+    )
+    if not post.is_published and post.author_id != user.pk:
+        raise Http404('Пост не найден')
+    return post
+
+
+def feed_etag_parts(tags, posts):
+    visibility_cutoff()
+    return [
+        sorted(get_tag_versions(tags).items()),
+        posts.aggregate(last_update=Max('updated_at'))['last_update'],
+    ]
+
+
+class IndexView(
+    AnonymousPageCacheMixin, ConditionalGetMixin, CommentCountMixin,
+    CursorPaginationMixin, ListView
+):
+    read_from_replica = True
     template_name = 'blog/index.html'
     paginate_by = PAGINATION
-    queryset = filter_posts_by_date(
-        annotate_comments(Post.objects)
-    )
+    paginator_class = WindowPaginator
+
+    def get_cache_tags(self):
+        return super().get_cache_tags() | {'feed'}
+
+    def get_etag_parts(self):
+        return feed_etag_parts(
+            self.get_cache_tags(), Post.objects.filter(is_visible=True)
+        )
+
+    def get_queryset(self):
+        return filter_posts_by_date(
+            annotate_comments(Post.objects)
+        )
 
 
-class PostDetailView(ListView):
+class PostDetailView(ConditionalGetMixin, ListView):
+    read_from_replica = True
     model = Post
     context_object_name = 'post'
     template_name = 'blog/post_detail.html'
     paginate_by = PAGINATION
+    paginator_class = WindowPaginator
 
+    @memoize_lookup
     def get_post(self):
-        post = get_object_or_404(Post, pk=self.kwargs.get('post_pk'))
-        if not post.is_published and post.author != self.request.user:
-            raise Http404('Пост не найден')
-        return post
+        return get_post_or_404(self.request.user, self.kwargs.get('post_pk'))
+
+    def get_etag_parts(self):
+        post = self.get_post()
+        return [
+            post.updated_at,
+            post.comment_count,
+            get_tag_versions({f'post:{post.pk}'}),
+        ]
 
     def get_queryset(self):
-        return self.get_post().comments.select_related('author')
+        return self.get_post().comments.select_related(
+            'author'
+        ).only(*COMMENT_FIELDS).order_by('created_at')
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -108,11 +162,17 @@ class DeleteCommentView(CommentMixin, UserPassesMixin, DeleteView):
     pass
 
 
-class CategoryView(ListView):
+class CategoryView(
+    AnonymousPageCacheMixin, ConditionalGetMixin, CommentCountMixin,
+    CursorPaginationMixin, ListView
+):
+    read_from_replica = True
     template_name = 'blog/category.html'
     slug_url_kwarg = 'category'
     paginate_by = PAGINATION
+    paginator_class = WindowPaginator
 
+    @memoize_lookup
     def get_category(self):
         category = get_object_or_404(
             Category,
@@ -121,6 +181,18 @@ class CategoryView(ListView):
         )
         return category
 
+    def get_cache_tags(self):
+        category_id = self.get_category().id
+        return super().get_cache_tags() | {
+            f'category:{category_id}', f'feed:category:{category_id}'
+        }
+
+    def get_etag_parts(self):
+        return feed_etag_parts(
+            self.get_cache_tags(),
+            self.get_category().posts.filter(is_visible=True)
+        )
+
     def get_queryset(self):
         return filter_posts_by_date(
             annotate_comments(
@@ -132,3 +204,29 @@ class CategoryView(ListView):
         context = super().get_context_data(**kwargs)
         context['category'] = self.get_category()
         return context
+
+
+class SearchView(ListView):
+    read_from_replica = True
+    template_name = 'blog/search.html'
+    paginate_by = PAGINATION
+    paginator_class = WindowPaginator
+
+    def get_search_query(self):
+        return self.request.GET.get('q', '').strip()
+
+    def get_queryset(self):
+        query = self.get_search_query()
+        if not query:
+            return Post.objects.none()
+        return search_posts(
+            filter_posts_by_date(
+                annotate_comments(Post.objects, POST_SEARCH_FIELDS)
+            ),
+            query
+        )
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['query'] = self.get_search_query()
+        return context
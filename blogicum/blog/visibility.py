@@ -0,0 +1,122 @@
+"""Видимость публикаций в ленте.
+
+Флаг `Post.is_visible` хранит, опубликованы ли сама публикация и её
+категория. Лента показывает видимые публикации с `pub_date` не позже
+«фронтира». Фронтир сдвигается, когда наступает дата ближайшей
+отложенной публикации, истекает интервал VISIBILITY_BUCKET или, без
+интервала, не реже чем раз в VISIBILITY_MAX_AGE секунд: публикации,
+сохранённые другим процессом, появляются не позже этого срока, даже если
+кэш у процессов свой. Закэшированные страницы сбрасываются, только если
+при сдвиге фронтира действительно появились новые публикации.
+"""
+from datetime import timedelta
+
+from django.db.models import Min
+from django.utils.timezone import now
+
+from .cache import VISIBILITY_TAG, get_cache, invalidate_tags
+from .constants import (
+    PAGE_CACHE_TIMEOUT, VISIBILITY_BATCH_SIZE, VISIBILITY_BUCKET,
+    VISIBILITY_MAX_AGE
+)
+from .models import Post
+
+VISIBILITY_KEY = 'blog:visibility'
+
+
+def floor_to_bucket(moment):
+    if not VISIBILITY_BUCKET:
+        return moment
+    timestamp = moment.timestamp()
+    return moment - timedelta(seconds=timestamp % VISIBILITY_BUCKET)
+
+
+def store_state(frontier, expires, current):
+    timeout = PAGE_CACHE_TIMEOUT
+    if expires is not None:
+        timeout = min(timeout, (expires - current).total_seconds())
+    get_cache().set(VISIBILITY_KEY, (frontier, expires), max(timeout, 1))
+
+
+def refresh_visibility(current=None, previous=None):
+    """Сдвигает фронтир к текущему моменту.
+
+    Если передан прежний фронтир previous, тег VISIBILITY_TAG
+    сбрасывается, только когда между фронтирами есть видимые публикации.
+    """
+    current = current or now()
+    frontier = floor_to_bucket(current)
+    expires = Post.objects.filter(
+        is_visible=True, pub_date__gt=frontier
+    ).aggregate(next_pub_date=Min('pub_date'))['next_pub_date']
+    if VISIBILITY_BUCKET:
+        bucket_end = frontier + timedelta(seconds=VISIBILITY_BUCKET)
+        expires = max(expires or bucket_end, bucket_end)
+    else:
+        max_age_end = current + timedelta(seconds=VISIBILITY_MAX_AGE)
+        expires = min(expires or max_age_end, max_age_end)
+    store_state(frontier, expires, current)
+    if previous is None or Post.objects.filter(
+        is_visible=True, pub_date__gt=previous, pub_date__lte=frontier
+    ).exists():
+        invalidate_tags(VISIBILITY_TAG)
+    return frontier
+
+
+def visibility_cutoff():
+    state = get_cache().get(VISIBILITY_KEY)
+    current = now()
+    if state is None:
+        return refresh_visibility(current)
+    if state[1] is not None and current >= state[1]:
+        return refresh_visibility(current, state[0])
+    return state[0]
+
+
+def schedule_publication(pub_date):
+    state = get_cache().get(VISIBILITY_KEY)
+    if state is None:
+        return
+    frontier, expires = state
+    current = now()
+    if expires is not None and current >= expires:
+        return
+    if pub_date <= current:
+        frontier = max(frontier, pub_date)
+    elif expires is None or pub_date < expires:
+        expires = pub_date
+    store_state(frontier, expires, current)
+
+
+def update_posts(posts, batch_size=VISIBILITY_BATCH_SIZE, **values):
+    """Обновляет публикации пачками по первичному ключу.
+
+    Вместе с values каждой пачке ставится текущее `updated_at`, чтобы
+    сбросить закэшированные карточки.
+    """
+    updated = last_pk = 0
+    while True:
+        batch = list(
+            posts.filter(pk__gt=last_pk)
+            .order_by('pk')
+            .values_list('pk', flat=True)
+            .distinct()[:batch_size]
+        )
+        if not batch:
+            return updated
+        updated += Post.objects.filter(pk__in=batch).update(
+            updated_at=now(), **values
+        )
+        last_pk = batch[-1]
+
+
+def set_posts_visibility(posts, visible, batch_size=VISIBILITY_BATCH_SIZE):
+    """Переключает `is_visible` у публикаций пачками по batch_size.
+
+    При visible=True флаг ставится только публикациям, которые
+    опубликованы вместе со своей категорией.
+    """
+    posts = posts.filter(is_visible=not visible)
+    if visible:
+        posts = posts.filter(is_published=True, category__is_published=True)
+    return update_posts(posts, batch_size, is_visible=visible)
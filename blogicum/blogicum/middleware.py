@@ -0,0 +1,175 @@
+import json
+import logging
+import random
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+from .routers import PIN_COOKIE, replica_reads
+
+logger = logging.getLogger('blogicum.timing')
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+class RequestTimings:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.view_started = None
+        self.view_finished = None
+        self.render_finished = None
+        self.queries = 0
+        self.db_time = 0.0
+        self.card_hits = 0
+        self.card_misses = 0
+
+    def record_query(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - started
+            self.queries += 1
+
+    def record_card(self, hit):
+        if hit:
+            self.card_hits += 1
+        else:
+            self.card_misses += 1
+
+    def metrics(self):
+        finished = time.perf_counter()
+        view_finished = self.view_finished or finished
+        metrics = {
+            'db': self.db_time,
+            'view': view_finished - (self.view_started or self.started),
+            'total': finished - self.started,
+        }
+        if self.render_finished is not None:
+            metrics['tpl'] = self.render_finished - view_finished
+        return {name: value * 1000 for name, value in metrics.items()}
+
+
+class ServerTimingMiddleware:
+    """Измеряет запросы к БД, работу view и шаблонов для каждого запроса.
+
+    Результат вместе с попаданиями и промахами кэша карточек публикаций
+    отдаётся в заголовке Server-Timing и пишется в лог
+    `blogicum.timing`. Для маршрутов из QUERY_BUDGETS проверяется
+    количество SQL-запросов.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.budgets = getattr(settings, 'QUERY_BUDGETS', {})
+        self.raise_on_budget = getattr(settings, 'QUERY_BUDGET_RAISE', False)
+
+    def __call__(self, request):
+        timings = RequestTimings()
+        request.timings = timings
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(
+                    connection.execute_wrapper(timings.record_query)
+                )
+            response = self.get_response(request)
+        metrics = timings.metrics()
+        url_name = getattr(request.resolver_match, 'view_name', None)
+        server_timing = [
+            f'{name};dur={value:.2f}'
+            + (f';desc="{timings.queries} queries"' if name == 'db' else '')
+            for name, value in metrics.items()
+        ]
+        if timings.card_hits or timings.card_misses:
+            server_timing.append(
+                f'cards;desc="{timings.card_hits} hits,'
+                f' {timings.card_misses} misses"'
+            )
+        response['Server-Timing'] = ', '.join(server_timing)
+        logger.info(json.dumps({
+            'url_name': url_name,
+            'method': request.method,
+            'status': response.status_code,
+            'queries': timings.queries,
+            'card_hits': timings.card_hits,
+            'card_misses': timings.card_misses,
+            **{
+                f'{name}_ms': round(value, 2)
+                for name, value in metrics.items()
+            },
+        }))
+        self.check_budget(url_name, timings.queries)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.timings.view_started = time.perf_counter()
+
+    def process_template_response(self, request, response):
+        timings = request.timings
+        timings.view_finished = time.perf_counter()
+        response.add_post_render_callback(
+            lambda rendered: setattr(
+                timings, 'render_finished', time.perf_counter()
+            )
+        )
+        return response
+
+    def check_budget(self, url_name, queries):
+        budget = self.budgets.get(url_name)
+        if budget is None or queries <= budget:
+            return
+        message = (
+            f'Маршрут {url_name} выполнил {queries} SQL-запросов'
+            f' при бюджете {budget}'
+        )
+        if self.raise_on_budget:
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
+
+
+class ReplicaRoutingMiddleware:
+    """Разрешает view с `read_from_replica = True` читать из реплики.
+
+    Реплика из DATABASE_REPLICAS выбирается один раз на запрос. После
+    запроса на запись пользователь получает cookie, и в течение
+    REPLICA_PIN_SECONDS его чтения идут в основную базу, чтобы он сразу
+    видел свои изменения. Страницы, которые попадут в кэш для всех
+    читателей, строятся по основной базе.
+    """
+
+    safe_methods = ('GET', 'HEAD', 'OPTIONS')
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.pin_seconds = getattr(settings, 'REPLICA_PIN_SECONDS', 10)
+
+    def __call__(self, request):
+        try:
+            response = self.get_response(request)
+        finally:
+            token = getattr(request, '_replica_reads_token', None)
+            if token is not None:
+                replica_reads.reset(token)
+        if request.method not in self.safe_methods:
+            response.set_cookie(
+                PIN_COOKIE, '1', max_age=self.pin_seconds,
+                httponly=True, samesite='Lax',
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view = getattr(view_func, 'view_class', view_func)
+        replicas = getattr(settings, 'DATABASE_REPLICAS', ())
+        if (
+            replicas
+            and request.method in self.safe_methods
+            and getattr(view, 'read_from_replica', False)
+            and PIN_COOKIE not in request.COOKIES
+        ):
+            request._replica_reads_token = replica_reads.set(
+                random.choice(replicas)
+            )
@@ -0,0 +1,33 @@
+from contextvars import ContextVar
+
+PRIMARY_DB = 'default'
+PIN_COOKIE = 'primary_pin'
+PRIMARY_APPS = frozenset({'sessions'})
+
+replica_reads = ContextVar('replica_reads', default=None)
+
+
+def read_from_primary():
+    """До конца запроса направляет чтения в основную базу."""
+    replica_reads.set(None)
+
+
+class ReplicaRouter:
+    """Направляет чтения в реплику, а запись — в основную базу.
+
+    Реплика выбирается middleware один раз на запрос для view с
+    `read_from_replica = True` и хранится в `replica_reads`, поэтому все
+    запросы страницы читают из одной реплики.
+    """
+
+    def db_for_read(self, model, **hints):
+        replica = replica_reads.get()
+        if replica is None or model._meta.app_label in PRIMARY_APPS:
+            return PRIMARY_DB
+        return replica
+
+    def db_for_write(self, model, **hints):
+        return PRIMARY_DB
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -33,6 +34,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'blogicum.middleware.ServerTimingMiddleware',
+    'blogicum.middleware.ReplicaRoutingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -43,6 +46,31 @@ MIDDLEWARE = [
     'debug_toolbar.middleware.DebugToolbarMiddleware',
 ]
 
+QUERY_BUDGETS = {
+    'blog:index': 6,
+    'blog:category_posts': 6,
+    'blog:post_detail': 7,
+    'blog:search': 6,
+    'profile': 6,
+}
+QUERY_BUDGET_RAISE = False
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'blogicum.timing': {
+            'handlers': ['console'],
+            'level': 'INFO',
+        },
+    },
+}
+
 ROOT_URLCONF = 'blogicum.urls'
 TEMPLATES_DIR = BASE_DIR / 'templates'
 
@@ -72,6 +100,29 @@ DATABASES = {
     }
 }
 
+# Реплики задаются путями к файлам через запятую, например
+# DJANGO_REPLICA_DB_PATHS=/tmp/replica.sqlite3 для копии основной базы.
+DATABASE_REPLICAS = []
+for number, path in enumerate(
+    filter(None, os.getenv('DJANGO_REPLICA_DB_PATHS', '').split(',')),
+    start=1
+):
+    DATABASES[f'replica{number}'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': path,
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICAS.append(f'replica{number}')
+
+DATABASE_ROUTERS = ['blogicum.routers.ReplicaRouter']
+REPLICA_PIN_SECONDS = 10
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -104,4 +155,7 @@ STATIC_URL = '/static/'
 STATICFILES_DIRS = [BASE_DIR / 'static', ]
 MEDIA_ROOT = 'blogicum/media/'
 
+SITEMAP_ROOT = Path(os.getenv('DJANGO_SITEMAP_ROOT', BASE_DIR / 'sitemaps'))
+SITEMAP_BASE_URL = os.getenv('DJANGO_SITE_URL', 'http://127.0.0.1:8000')
+
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
@@ -14,6 +14,7 @@ urlpatterns = [
     path('', include('users.urls')),
     path('auth/', include('django.contrib.auth.urls')),
     path('pages/', include('pages.urls', namespace='pages')),
+    path('api/', include('blog.api.urls', namespace='api')),
 ]
 
 if settings.DEBUG:
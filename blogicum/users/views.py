@@ -6,7 +6,14 @@ from django.shortcuts import get_object_or_404, reverse
 from django.urls import reverse_lazy
 
 from blog.constants import PAGINATION
-from blog.views import annotate_comments, filter_posts_by_date
+from blog.mixin import (
+    AnonymousPageCacheMixin, CommentCountMixin, ConditionalGetMixin,
+    CursorPaginationMixin, memoize_lookup
+)
+from blog.paginator import WindowPaginator
+from blog.views import (
+    annotate_comments, feed_etag_parts, filter_posts_by_date
+)
 
 User = get_user_model()
 
@@ -28,6 +35,7 @@ class UserUpdateView(LoginRequiredMixin, UserPassesTestMixin, UpdateView):
     )
     template_name = 'users/user_form.html'
 
+    @memoize_lookup
     def get_object(self, queryset=None):
         return get_object_or_404(User, username=self.kwargs.get('username'))
 
@@ -41,12 +49,18 @@ class UserUpdateView(LoginRequiredMixin, UserPassesTestMixin, UpdateView):
         return self.request.user.username == self.kwargs['username']
 
 
-class ProfileView(ListView):
+class ProfileView(
+    AnonymousPageCacheMixin, ConditionalGetMixin, CommentCountMixin,
+    CursorPaginationMixin, ListView
+):
+    read_from_replica = True
     model = User
     template_name = 'users/profile.html'
     paginate_by = PAGINATION
+    paginator_class = WindowPaginator
     slug_url_kwarg = 'username'
 
+    @memoize_lookup
     def get_profile(self):
         profile = get_object_or_404(
             User,
@@ -54,6 +68,17 @@ class ProfileView(ListView):
         )
         return profile
 
+    def get_cache_tags(self):
+        profile_id = self.get_profile().id
+        return super().get_cache_tags() | {
+            f'user:{profile_id}', f'feed:user:{profile_id}'
+        }
+
+    def get_etag_parts(self):
+        return feed_etag_parts(
+            self.get_cache_tags(), self.get_profile().posts.all()
+        )
+
     def get_queryset(self):
         queryset = annotate_comments(self.get_profile().posts)
         if self.request.user.username != self.kwargs['username']:
@@ -0,0 +1,112 @@
+"""Сравнение стратегий подсчёта комментариев на разных объёмах данных.
+
+Для каждого размера набора создаётся временная база, затем замеряется
+медианное время получения первой и глубокой страниц ленты вместе
+с подсчётом комментариев. Запуск из корня репозитория:
+
+    python tests/benchmarks/comment_counts.py --sizes 1000 10000 100000
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parents[2] / 'blogicum'
+PAGE_SIZE = 10
+
+
+def seed(posts, comments_per_post):
+    from django.contrib.auth import get_user_model
+    from django.utils import timezone
+
+    from blog.comment_counts import comment_count_subquery
+    from blog.models import Category, Comment, Location, Post
+
+    author = get_user_model().objects.create(username='bench')
+    category = Category.objects.create(
+        title='Категория', description='Описание', slug='bench'
+    )
+    location = Location.objects.create(name='Место')
+    now = timezone.now()
+    Post.objects.bulk_create((
+        Post(
+            title=f'Публикация {i}', text='Текст публикации.',
+            excerpt='Текст публикации.', author=author, category=category,
+            location=location, pub_date=now - timezone.timedelta(minutes=i),
+        )
+        for i in range(posts)
+    ), batch_size=5000)
+    post_ids = list(Post.objects.values_list('pk', flat=True))
+    Comment.objects.bulk_create((
+        Comment(post_id=post_id, author=author, text='Комментарий')
+        for post_id in post_ids
+        for _ in range(post_id % (2 * comments_per_post + 1))
+    ), batch_size=5000)
+    Post.objects.update(comment_count=comment_count_subquery())
+
+
+def measure(strategy, page, repeat):
+    from django.core.paginator import Paginator
+
+    from blog.comment_counts import annotate_comment_count, fill_comment_counts
+    from blog.models import Post
+    from blog.views import annotate_comments, filter_posts_by_date
+
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        queryset = annotate_comment_count(
+            filter_posts_by_date(annotate_comments(Post.objects)), strategy
+        )
+        posts = list(Paginator(queryset, PAGE_SIZE).page(page).object_list)
+        fill_comment_counts(posts, strategy)
+        timings.append((time.perf_counter() - started) * 1000)
+    return round(statistics.median(timings), 2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        '--sizes', type=int, nargs='+', default=[1000, 10000, 100000]
+    )
+    parser.add_argument('--comments', type=int, default=3)
+    parser.add_argument('--repeat', type=int, default=7)
+    args = parser.parse_args()
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'blogicum.settings')
+    sys.path.insert(0, str(PROJECT_DIR))
+    import django
+    from django.conf import settings
+
+    settings.DEBUG = False
+    django.setup()
+    from django.core.management import call_command
+    from django.db import connection
+
+    from blog.comment_counts import STRATEGIES
+
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for size in args.sizes:
+            connection.close()
+            connection.settings_dict['NAME'] = str(
+                Path(directory) / f'bench_{size}.sqlite3'
+            )
+            call_command('migrate', verbosity=0)
+            seed(size, args.comments)
+            pages = {'first': 1, 'deep': max(1, size // PAGE_SIZE // 2)}
+            results[size] = {
+                strategy: {
+                    f'{name}_ms': measure(strategy, page, args.repeat)
+                    for name, page in pages.items()
+                }
+                for strategy in STRATEGIES
+            }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
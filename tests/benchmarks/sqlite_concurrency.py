@@ -0,0 +1,143 @@
+"""Пропускная способность SQLite при одновременных чтениях и записях.
+
+Сравнивает настройки для разработки (blogicum.settings) и боевые
+(blogicum.settings_production). Каждый профиль запускается в отдельном
+процессе на временной базе: читатели выбирают первую страницу ленты,
+писатели добавляют комментарии. Запуск из корня репозитория:
+
+    python tests/benchmarks/sqlite_concurrency.py --readers 8 --writers 2
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parents[2] / 'blogicum'
+PROFILES = {
+    'development': 'blogicum.settings',
+    'production': 'blogicum.settings_production',
+}
+
+
+def seed(posts):
+    from django.contrib.auth import get_user_model
+    from django.utils import timezone
+
+    from blog.models import Category, Location, Post
+
+    author = get_user_model().objects.create(username='bench')
+    category = Category.objects.create(
+        title='Категория', description='Описание', slug='bench'
+    )
+    location = Location.objects.create(name='Место')
+    now = timezone.now()
+    Post.objects.bulk_create(
+        Post(
+            title=f'Публикация {i}', text='Текст публикации. ' * 50,
+            excerpt='Текст публикации.', author=author, category=category,
+            location=location, pub_date=now - timezone.timedelta(hours=i),
+        )
+        for i in range(posts)
+    )
+    return author
+
+
+def worker(operation, stop, results):
+    from django.db import OperationalError, connection
+
+    done = errors = 0
+    while not stop.is_set():
+        try:
+            operation()
+            done += 1
+        except OperationalError:
+            errors += 1
+    connection.close()
+    results.append((done, errors))
+
+
+def run_profile(args):
+    os.environ['DJANGO_SETTINGS_MODULE'] = PROFILES[args.run]
+    sys.path.insert(0, str(PROJECT_DIR))
+    from django.conf import settings
+
+    settings.DATABASES['default']['NAME'] = args.database
+    import django
+
+    django.setup()
+    from django.core.management import call_command
+
+    from blog.models import Comment, Post
+    from blog.views import annotate_comments, filter_posts_by_date
+
+    call_command('migrate', verbosity=0)
+    author = seed(args.posts)
+    post_ids = list(Post.objects.values_list('pk', flat=True))
+
+    def read():
+        list(filter_posts_by_date(annotate_comments(Post.objects))[:10])
+
+    def write():
+        Comment.objects.create(
+            post_id=post_ids[time.perf_counter_ns() % len(post_ids)],
+            author=author, text='Комментарий',
+        )
+
+    stop = threading.Event()
+    reads, writes = [], []
+    threads = [
+        threading.Thread(target=worker, args=(read, stop, reads))
+        for _ in range(args.readers)
+    ] + [
+        threading.Thread(target=worker, args=(write, stop, writes))
+        for _ in range(args.writers)
+    ]
+    for thread in threads:
+        thread.start()
+    time.sleep(args.duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    print(json.dumps({
+        'reads_per_s': round(sum(d for d, _ in reads) / args.duration, 1),
+        'writes_per_s': round(sum(d for d, _ in writes) / args.duration, 1),
+        'errors': sum(e for _, e in reads + writes),
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--readers', type=int, default=8)
+    parser.add_argument('--writers', type=int, default=2)
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--posts', type=int, default=1000)
+    parser.add_argument('--run', choices=PROFILES, help=argparse.SUPPRESS)
+    parser.add_argument('--database', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.run:
+        return run_profile(args)
+    results = {}
+    for profile in PROFILES:
+        with tempfile.TemporaryDirectory() as directory:
+            output = subprocess.run(
+                [
+                    sys.executable, __file__, '--run', profile,
+                    '--database', str(Path(directory) / 'bench.sqlite3'),
+                    '--readers', str(args.readers),
+                    '--writers', str(args.writers),
+                    '--duration', str(args.duration),
+                    '--posts', str(args.posts),
+                ],
+                check=True, capture_output=True, text=True,
+            ).stdout
+        results[profile] = json.loads(output.splitlines()[-1])
+    print(json.dumps(results, indent=2, ensure_ascii=False))
+
+
+if __name__ == '__main__':
+    main()
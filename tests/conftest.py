@@ -41,6 +41,14 @@ def enable_debug_false():
         yield
 
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    from django.core.cache import cache
+
+    cache.clear()
+    yield
+
+
 class SafeImportFromContextManager:
     def __init__(
             self,
@@ -353,9 +361,9 @@ def cleanup(request):
 
     yield
 
-    from blogicum import settings
+    from django.conf import settings
 
-    image_dir = Path(settings.__file__).parent.parent / settings.MEDIA_ROOT
+    image_dir = Path(settings.MEDIA_ROOT).resolve()
 
     for root, dirs, files in os.walk(image_dir):
         for filename in files:
@@ -363,6 +371,7 @@ def cleanup(request):
                     filename.endswith(".jpg")
                     or filename.endswith(".gif")
                     or filename.endswith(".png")
+                    or filename.endswith(".webp")
             ):
                 file_path = os.path.join(root, filename)
                 if os.path.getmtime(file_path) >= start_time:
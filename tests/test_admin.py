@@ -0,0 +1,132 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from blog.constants import INLINE_POSTS_LIMIT
+
+pytestmark = [pytest.mark.django_db]
+
+
+def query_plan(sql):
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+        return ' '.join(str(row[-1]) for row in cursor.fetchall())
+
+
+@pytest.fixture
+def users(mixer):
+    return mixer.cycle(30).blend('auth.User', username=mixer.sequence(
+        'admin_user_{0}'
+    ))
+
+
+@pytest.mark.parametrize('url_name', (
+    'admin:blog_post_changelist',
+    'admin:blog_post_change',
+))
+def test_post_admin_has_no_user_select(admin_client, users, mixer, url_name):
+    post = mixer.blend('blog.Post', author=users[0])
+    args = [post.id] if url_name.endswith('change') else []
+    response = admin_client.get(reverse(url_name, args=args))
+    assert response.status_code == 200
+    assert 'admin_user_29' not in response.content.decode('utf-8'), (
+        'Убедитесь, что в админке публикаций поле автора не выводит'
+        ' всех пользователей в выпадающем списке.'
+    )
+
+
+def test_user_autocomplete(admin_client, users):
+    response = admin_client.get(reverse('admin:autocomplete'), {
+        'term': 'admin_user_2',
+        'app_label': 'blog',
+        'model_name': 'post',
+        'field_name': 'author',
+    })
+    assert response.status_code == 200
+    found = {item['text'] for item in response.json()['results']}
+    assert 'admin_user_2' in found
+    assert 'admin_user_1' not in found, (
+        'Убедитесь, что автодополнение пользователей ищет по началу имени.'
+    )
+
+
+def test_user_autocomplete_uses_username_index(admin_client, users):
+    with CaptureQueriesContext(connection) as captured:
+        admin_client.get(reverse('admin:autocomplete'), {
+            'term': 'admin_user_2',
+            'app_label': 'blog',
+            'model_name': 'post',
+            'field_name': 'author',
+        })
+    search = next(
+        query['sql'] for query in captured
+        if '"auth_user"."username" >=' in query['sql']
+    )
+    assert 'SCAN auth_user' not in query_plan(search), (
+        'Убедитесь, что автодополнение пользователей выполняется'
+        ' по индексу поля username.'
+    )
+
+
+def test_user_changelist_searches_by_email(admin_client, users):
+    users[3].email = 'reader@example.com'
+    users[3].save()
+    response = admin_client.get(
+        reverse('admin:auth_user_changelist'), {'q': 'reader@example'}
+    )
+    assert list(response.context['cl'].result_list) == [users[3]], (
+        'Убедитесь, что в списке пользователей сохранён поиск'
+        ' по имени, фамилии и адресу электронной почты.'
+    )
+
+
+def test_category_inline_is_limited(admin_client, mixer):
+    category = mixer.blend('blog.Category')
+    mixer.cycle(INLINE_POSTS_LIMIT + 5).blend('blog.Post', category=category)
+    response = admin_client.get(
+        reverse('admin:blog_category_change', args=[category.id])
+    )
+    assert response.status_code == 200
+    formset = response.context['inline_admin_formsets'][0].formset
+    assert len(formset.forms) == INLINE_POSTS_LIMIT, (
+        'Убедитесь, что в карточке категории выводится не больше'
+        f' {INLINE_POSTS_LIMIT} публикаций.'
+    )
+
+
+@pytest.mark.parametrize('url_name', (
+    'admin:blog_post_changelist',
+    'admin:blog_comment_changelist',
+    'admin:auth_user_changelist',
+))
+def test_changelist_queries_do_not_grow(admin_client, mixer, url_name):
+    url = reverse(url_name)
+
+    def count_queries(rows):
+        authors = mixer.cycle(rows).blend('auth.User')
+        for author in authors:
+            post = mixer.blend('blog.Post', author=author)
+            mixer.blend('blog.Comment', post=post, author=author)
+        with CaptureQueriesContext(connection) as captured:
+            assert admin_client.get(url).status_code == 200
+        return len(captured)
+
+    few, many = count_queries(2), count_queries(20)
+    assert few == many, (
+        f'Убедитесь, что число SQL-запросов на странице `{url}`'
+        ' не зависит от количества строк в списке.'
+    )
+
+
+def test_users_sorted_by_posts_count(admin_client, users, mixer):
+    mixer.cycle(3).blend('blog.Post', author=users[5])
+    response = admin_client.get(
+        reverse('admin:auth_user_changelist'), {'o': '-2'}
+    )
+    assert response.status_code == 200
+    first = response.context['cl'].result_list[0]
+    assert first == users[5] and first.posts_count == 3, (
+        'Убедитесь, что пользователей в админке можно упорядочить'
+        ' по количеству публикаций.'
+    )
@@ -0,0 +1,154 @@
+import json
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from blog.models import Post
+from blog.views import filter_posts_by_date
+
+pytestmark = [pytest.mark.django_db]
+
+
+def get_json(client, url, **params):
+    response = client.get(url, params)
+    content = (
+        b''.join(response.streaming_content) if response.streaming
+        else response.content
+    )
+    return response, json.loads(content)
+
+
+def walk(client, url, **params):
+    ids = []
+    cursor = None
+    while True:
+        response, data = get_json(
+            client, url, **params, **({'cursor': cursor} if cursor else {})
+        )
+        assert response.status_code == HTTPStatus.OK
+        ids.extend(item['id'] for item in data['results'])
+        cursor = data['next']
+        if cursor is None:
+            return ids
+
+
+def test_api_walks_visible_posts(
+        client, user, published_category,
+        many_posts_with_published_locations,
+        unpublished_posts_with_published_locations):
+    expected = list(filter_posts_by_date(Post.objects.all()).order_by(
+        '-pub_date', '-pk'
+    ).values_list('pk', flat=True))
+    for url in (
+        reverse('api:posts'),
+        reverse('api:category_posts', args=[published_category.slug]),
+        reverse('api:profile_posts', args=[user.username]),
+    ):
+        assert walk(client, url, limit=7) == expected, (
+            f'Убедитесь, что `{url}` отдаёт опубликованные публикации'
+            ' от новых к старым без пропусков и повторов.'
+        )
+
+
+def test_api_profile_shows_own_hidden_posts(
+        user_client, user, many_posts_with_published_locations,
+        unpublished_posts_with_published_locations):
+    ids = walk(
+        user_client, reverse('api:profile_posts', args=[user.username]),
+        limit=50,
+    )
+    assert len(ids) == user.posts.count(), (
+        'Убедитесь, что автор видит в API все свои публикации.'
+    )
+
+
+def test_api_sparse_fields(client, many_posts_with_published_locations):
+    with CaptureQueriesContext(connection) as captured:
+        response, data = get_json(
+            client, reverse('api:posts'), fields='id,title'
+        )
+    assert all(set(item) == {'id', 'title'} for item in data['results']), (
+        'Убедитесь, что параметр `fields` ограничивает поля ответа.'
+    )
+    assert not any(
+        '"blog_post"."excerpt"' in query['sql']
+        or 'auth_user' in query['sql']
+        for query in captured.captured_queries
+    ), 'Убедитесь, что из базы читаются только запрошенные поля.'
+
+
+@pytest.mark.parametrize('params', (
+    {'fields': 'id,password'},
+    {'cursor': 'not-a-cursor'},
+    {'limit': '0'},
+    {'limit': 'many'},
+))
+def test_api_bad_request(client, params):
+    response, data = get_json(client, reverse('api:posts'), **params)
+    assert response.status_code == HTTPStatus.BAD_REQUEST, (
+        'Убедитесь, что неверные параметры API возвращают ошибку 400.'
+    )
+    assert 'detail' in data
+
+
+def test_api_post_detail(
+        client, user_client, mixer, user, published_category,
+        post_with_published_location):
+    post = post_with_published_location
+    response, data = get_json(client, reverse('api:post', args=[post.id]))
+    assert response.status_code == HTTPStatus.OK
+    assert (data['id'], data['text'], data['author']) == (
+        post.id, post.text, user.username
+    )
+    hidden = mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        is_published=False,
+    )
+    for url in (
+        reverse('api:post', args=[hidden.id]),
+        reverse('api:comments', args=[hidden.id]),
+    ):
+        response, data = get_json(client, url)
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Убедитесь, что API не отдаёт снятую с публикации публикацию'
+            ' и её комментарии другим пользователям.'
+        )
+        assert 'detail' in data
+        response, _ = get_json(user_client, url)
+        assert response.status_code == HTTPStatus.OK, (
+            'Убедитесь, что автор получает свою снятую с публикации'
+            ' публикацию через API.'
+        )
+
+
+def test_api_comments_and_categories(
+        client, mixer, user, published_category,
+        post_with_published_location):
+    post = post_with_published_location
+    comments = mixer.cycle(5).blend('blog.Comment', post=post, author=user)
+    ids = walk(client, reverse('api:comments', args=[post.id]), limit=2)
+    assert ids == [comment.id for comment in reversed(comments)], (
+        'Убедитесь, что API отдаёт все комментарии публикации.'
+    )
+    mixer.blend('blog.Category', is_published=False)
+    _, data = get_json(client, reverse('api:categories'))
+    assert [item['slug'] for item in data['results']] == [
+        published_category.slug
+    ], 'Убедитесь, что API отдаёт только опубликованные категории.'
+
+
+def test_api_list_queries_run_inside_view(
+        client, many_posts_with_published_locations):
+    response = client.get(reverse('api:posts'))
+    with CaptureQueriesContext(connection) as captured:
+        b''.join(response.streaming_content)
+    assert not captured.captured_queries, (
+        'Убедитесь, что строки списка читаются до начала потоковой'
+        ' отдачи ответа.'
+    )
+    assert '0 queries' not in response['Server-Timing'], (
+        'Убедитесь, что запросы списка учитываются в Server-Timing.'
+    )
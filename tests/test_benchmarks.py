@@ -0,0 +1,293 @@
+"""Замеры количества SQL-запросов, задержки и размера ответа по маршрутам.
+
+Размер синтетического набора данных и число повторов задаются
+переменными окружения:
+
+* BENCHMARK_POSTS — количество публикаций (по умолчанию 60);
+* BENCHMARK_REPEAT — сколько раз запрашивать каждый маршрут (5);
+* BENCHMARK_RESULTS — путь к JSON-файлу для сохранения результатов;
+* BENCHMARK_UPDATE_BASELINE=1 — перезаписать эталон benchmarks/baseline.json;
+* BENCHMARK_CHECK_LATENCY=1 — сравнивать с эталоном и задержку (p95).
+
+Маршруты замеряются для автора публикаций, а GET-маршруты, открытые без
+входа, — ещё и для анонимного читателя (`anonymous:<маршрут>`, в том
+числе из кэша страниц) и для условного запроса с If-None-Match
+(`not_modified:<маршрут>`), если маршрут отдаёт ETag.
+
+Тест падает, если по какому-либо маршруту запросов к базе стало больше,
+чем в эталоне, или ответ вырос больше чем на SIZE_TOLERANCE.
+"""
+import json
+import os
+import statistics
+import time
+from http import HTTPStatus
+from pathlib import Path
+
+import pytest
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, reverse
+from django.utils import timezone
+
+BASELINE_PATH = Path(__file__).parent / 'benchmarks' / 'baseline.json'
+N_POSTS = int(os.getenv('BENCHMARK_POSTS', 60))
+REPEAT = int(os.getenv('BENCHMARK_REPEAT', 5))
+SIZE_TOLERANCE = 0.1
+LATENCY_TOLERANCE = 2.0
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def dataset(mixer):
+    users = [
+        mixer.blend('auth.User', username=f'bench_user_{i}')
+        for i in range(5)
+    ]
+    categories = [
+        mixer.blend(
+            'blog.Category', title=f'Категория {i}', slug=f'bench-{i}',
+            description='Описание категории', is_published=True,
+        )
+        for i in range(5)
+    ]
+    locations = [
+        mixer.blend('blog.Location', name=f'Место {i}', is_published=True)
+        for i in range(5)
+    ]
+    start = timezone.now() - timezone.timedelta(days=N_POSTS)
+    posts = [
+        mixer.blend(
+            'blog.Post',
+            title=f'Публикация {i}',
+            text='Текст публикации. ' * 50,
+            pub_date=start + timezone.timedelta(days=i),
+            author=users[i % len(users)],
+            category=categories[i % len(categories)],
+            location=locations[i % len(locations)],
+            is_published=True,
+        )
+        for i in range(N_POSTS)
+    ]
+    post = posts[-1]
+    comments = [
+        mixer.blend(
+            'blog.Comment', post=post, author=users[i % len(users)],
+            text=f'Комментарий {i}',
+        )
+        for i in range(15)
+    ]
+    return {
+        'author': post.author,
+        'post': post,
+        'comment': next(c for c in comments if c.author == post.author),
+    }
+
+
+def route_cases(data):
+    post, comment = data['post'], data['comment']
+    username = data['author'].username
+    return {
+        'blog:index': ('get', reverse('blog:index'), {}),
+        'blog:index?page=2': ('get', reverse('blog:index'), {'page': 2}),
+        'blog:post_detail': (
+            'get', reverse('blog:post_detail', args=[post.id]), {}
+        ),
+        'blog:create_post': ('get', reverse('blog:create_post'), {}),
+        'blog:edit_post': (
+            'get', reverse('blog:edit_post', args=[post.id]), {}
+        ),
+        'blog:delete_post': (
+            'get', reverse('blog:delete_post', args=[post.id]), {}
+        ),
+        'blog:add_comment': (
+            'post', reverse('blog:add_comment', args=[post.id]),
+            {'text': 'Новый комментарий'},
+        ),
+        'blog:edit_comment': (
+            'get', reverse('blog:edit_comment', args=[post.id, comment.id]),
+            {},
+        ),
+        'blog:delete_comment': (
+            'get',
+            reverse('blog:delete_comment', args=[post.id, comment.id]),
+            {},
+        ),
+        'blog:category_posts': (
+            'get', reverse('blog:category_posts', args=[post.category.slug]),
+            {},
+        ),
+        'blog:search': ('get', reverse('blog:search'), {'q': 'публикация'}),
+        'blog:feed_rss': ('get', reverse('blog:feed_rss'), {}),
+        'blog:feed_atom': ('get', reverse('blog:feed_atom'), {}),
+        'blog:category_feed_rss': (
+            'get',
+            reverse('blog:category_feed_rss', args=[post.category.slug]),
+            {},
+        ),
+        'blog:category_feed_atom': (
+            'get',
+            reverse('blog:category_feed_atom', args=[post.category.slug]),
+            {},
+        ),
+        'blog:author_feed_rss': (
+            'get', reverse('blog:author_feed_rss', args=[username]), {}
+        ),
+        'blog:author_feed_atom': (
+            'get', reverse('blog:author_feed_atom', args=[username]), {}
+        ),
+        'registration': ('get', reverse('registration'), {}),
+        'edit_profile': (
+            'get', reverse('edit_profile', args=[username]), {}
+        ),
+        'profile': ('get', reverse('profile', args=[username]), {}),
+        'pages:about': ('get', reverse('pages:about'), {}),
+        'pages:rules': ('get', reverse('pages:rules'), {}),
+        'api:posts': ('get', reverse('api:posts'), {}),
+        'api:post': ('get', reverse('api:post', args=[post.id]), {}),
+        'api:comments': (
+            'get', reverse('api:comments', args=[post.id]), {}
+        ),
+        'api:categories': ('get', reverse('api:categories'), {}),
+        'api:category_posts': (
+            'get', reverse('api:category_posts', args=[post.category.slug]),
+            {},
+        ),
+        'api:profile_posts': (
+            'get', reverse('api:profile_posts', args=[username]), {}
+        ),
+    }
+
+
+def named_routes():
+    from blog.api.urls import app_name as api_namespace
+    from blog.api.urls import urlpatterns as api_urls
+    from blog.urls import app_name as blog_namespace
+    from blog.urls import urlpatterns as blog_urls
+    from pages.urls import app_name as pages_namespace
+    from pages.urls import urlpatterns as pages_urls
+    from users.urls import urlpatterns as users_urls
+
+    for namespace, patterns in (
+        (blog_namespace, blog_urls),
+        (pages_namespace, pages_urls),
+        (None, users_urls),
+        (api_namespace, api_urls),
+    ):
+        for pattern in patterns:
+            if isinstance(pattern, URLPattern) and pattern.name:
+                yield (
+                    f'{namespace}:{pattern.name}' if namespace
+                    else pattern.name
+                )
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def measure(client, method, url, data, **extra):
+    getattr(client, method)(url, data, **extra)
+    timings = []
+    for _ in range(REPEAT):
+        with CaptureQueriesContext(connection) as captured:
+            started = time.perf_counter()
+            response = getattr(client, method)(url, data, **extra)
+            content = (
+                b''.join(response.streaming_content) if response.streaming
+                else response.content
+            )
+            timings.append((time.perf_counter() - started) * 1000)
+    assert response.status_code < 400, (
+        f'Маршрут `{url}` вернул код {response.status_code}.'
+    )
+    return {
+        'queries': len(captured.captured_queries),
+        'p50_ms': round(statistics.median(timings), 2),
+        'p95_ms': round(percentile(timings, 0.95), 2),
+        'size': len(content),
+    }
+
+
+def measure_anonymous(cases):
+    client = Client()
+    results = {}
+    for name, (method, url, data) in cases.items():
+        if method != 'get':
+            continue
+        response = client.get(url, data)
+        if response.status_code != HTTPStatus.OK:
+            continue
+        results[f'anonymous:{name}'] = measure(client, method, url, data)
+        if not response.has_header('ETag'):
+            continue
+        etag = response['ETag']
+        assert client.get(
+            url, data, HTTP_IF_NONE_MATCH=etag
+        ).status_code == HTTPStatus.NOT_MODIFIED, (
+            f'Маршрут `{url}` не отвечает 304 на совпадающий ETag.'
+        )
+        results[f'not_modified:{name}'] = measure(
+            client, method, url, data, HTTP_IF_NONE_MATCH=etag
+        )
+    return results
+
+
+def find_regressions(results, baseline):
+    check_latency = os.getenv('BENCHMARK_CHECK_LATENCY') == '1'
+    regressions = []
+    for name, result in results.items():
+        expected = baseline.get(name)
+        if expected is None:
+            continue
+        if result['queries'] > expected['queries']:
+            regressions.append(
+                f'{name}: запросов {result["queries"]}'
+                f' (эталон {expected["queries"]})'
+            )
+        if result['size'] > expected['size'] * (1 + SIZE_TOLERANCE):
+            regressions.append(
+                f'{name}: размер ответа {result["size"]}'
+                f' (эталон {expected["size"]})'
+            )
+        if (
+            check_latency
+            and result['p95_ms'] > expected['p95_ms'] * LATENCY_TOLERANCE
+        ):
+            regressions.append(
+                f'{name}: p95 {result["p95_ms"]} мс'
+                f' (эталон {expected["p95_ms"]} мс)'
+            )
+    return regressions
+
+
+def test_route_benchmarks(dataset):
+    cases = route_cases(dataset)
+    missing = set(named_routes()) - set(cases)
+    assert not missing, (
+        'Добавьте в бенчмарк маршруты: ' + ', '.join(sorted(missing))
+    )
+    client = Client()
+    client.force_login(dataset['author'])
+    results = {
+        name: measure(client, method, url, data)
+        for name, (method, url, data) in cases.items()
+    }
+    results.update(measure_anonymous(cases))
+    if os.getenv('BENCHMARK_RESULTS'):
+        Path(os.environ['BENCHMARK_RESULTS']).write_text(
+            json.dumps(results, indent=2, ensure_ascii=False)
+        )
+    if os.getenv('BENCHMARK_UPDATE_BASELINE') == '1':
+        BASELINE_PATH.write_text(
+            json.dumps(results, indent=2, ensure_ascii=False) + '\n'
+        )
+        return
+    baseline = json.loads(BASELINE_PATH.read_text())
+    regressions = find_regressions(results, baseline)
+    assert not regressions, (
+        'Производительность маршрутов ухудшилась:\n' + '\n'.join(regressions)
+    )
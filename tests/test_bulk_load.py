@@ -0,0 +1,130 @@
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from blog.bulk_load import iter_json_array
+from blog.models import Category, Comment, Post
+from blog.search import search_posts
+
+pytestmark = [pytest.mark.django_db]
+
+CREATED_AT = '2022-12-18T23:06:18.993Z'
+
+
+@pytest.fixture
+def fixture_objects(user, post_with_published_location):
+    post = post_with_published_location
+    return [
+        {'model': 'auth.permission', 'pk': 1000, 'fields': {}},
+        {
+            'model': 'blog.post', 'pk': 1000,
+            'fields': {
+                'created_at': CREATED_AT, 'is_published': True,
+                'title': 'Загруженная публикация',
+                'text': 'Первое второе третье четвёртое пятое шестое'
+                        ' седьмое восьмое девятое десятое одиннадцатое',
+                'pub_date': '2022-12-18T23:06:18Z',
+                'author': user.pk, 'category': 1000, 'location': None,
+            },
+        },
+        {
+            'model': 'blog.category', 'pk': 1000,
+            'fields': {
+                'created_at': CREATED_AT, 'is_published': True,
+                'title': 'Загруженная категория', 'slug': 'loaded',
+                'description': 'Описание',
+            },
+        },
+        *(
+            {
+                'model': 'blog.comment', 'pk': 1000 + i,
+                'fields': {
+                    'created_at': CREATED_AT, 'text': f'Комментарий {i}',
+                    'post': post_pk, 'author': user.pk,
+                },
+            }
+            for i, post_pk in enumerate((1000, 1000, post.pk))
+        ),
+    ]
+
+
+@pytest.mark.parametrize('suffix', ('json', 'jsonl'))
+def test_bulk_load(tmp_path, suffix, fixture_objects,
+                   post_with_published_location):
+    existing = post_with_published_location
+    updated_at = existing.updated_at
+    path = tmp_path / f'data.{suffix}'
+    path.write_text(
+        json.dumps(fixture_objects, ensure_ascii=False, indent=2)
+        if suffix == 'json'
+        else '\n'.join(json.dumps(obj) for obj in fixture_objects),
+        encoding='utf-8',
+    )
+    out = StringIO()
+    call_command('bulk_load', str(path), batch_size=2, stdout=out)
+    assert 'Пропущено auth.permission: 1' in out.getvalue()
+    assert 'в секунду' in out.getvalue(), (
+        'Убедитесь, что команда сообщает скорость загрузки.'
+    )
+    post = Post.objects.get(pk=1000)
+    assert Category.objects.filter(slug='loaded').exists()
+    assert Comment.objects.filter(pk__gte=1000).count() == 3
+    assert post.created_at.isoformat().startswith('2022-12-18T23:06:18'), (
+        'Убедитесь, что загрузка сохраняет дату добавления объектов.'
+    )
+    assert (post.comment_count, post.is_visible) == (2, True), (
+        'Убедитесь, что после загрузки пересчитываются число'
+        ' комментариев и видимость публикаций.'
+    )
+    assert post.excerpt.endswith('…')
+    assert list(search_posts(Post.objects.all(), 'одиннадцатое')) == [post], (
+        'Убедитесь, что загруженные публикации попадают в поисковый индекс.'
+    )
+    existing.refresh_from_db()
+    assert existing.comment_count == 1 and existing.updated_at > updated_at, (
+        'Убедитесь, что загрузка комментариев обновляет счётчик и время'
+        ' изменения существующих публикаций.'
+    )
+
+
+def test_iter_json_array_reads_in_chunks():
+    objects = [{'pk': i, 'text': 'а, б ] [ {}' * i} for i in range(20)]
+    assert list(iter_json_array(
+        StringIO(json.dumps(objects, ensure_ascii=False)), read_size=7
+    )) == objects
+
+
+@pytest.mark.parametrize('content', ('{"model": "blog.post"}', '[{"pk": 1'))
+def test_bulk_load_rejects_broken_file(tmp_path, content):
+    path = tmp_path / 'broken.json'
+    path.write_text(content, encoding='utf-8')
+    with pytest.raises(CommandError):
+        call_command('bulk_load', str(path), stdout=StringIO())
+
+
+def test_bulk_load_skips_dangling_rows(tmp_path, fixture_objects):
+    dangling = {
+        'model': 'blog.comment', 'pk': 2000,
+        'fields': {
+            'created_at': CREATED_AT, 'text': 'Без публикации',
+            'post': 999, 'author': fixture_objects[1]['fields']['author'],
+        },
+    }
+    path = tmp_path / 'data.jsonl'
+    path.write_text(
+        '\n'.join(json.dumps(obj) for obj in [*fixture_objects, dangling]),
+        encoding='utf-8',
+    )
+    with pytest.raises(CommandError):
+        call_command('bulk_load', str(path), batch_size=1, stdout=StringIO())
+    assert not Comment.objects.filter(pk=2000).exists(), (
+        'Убедитесь, что строки с несуществующими внешними ключами'
+        ' не попадают в базу.'
+    )
+    post = Post.objects.get(pk=1000)
+    assert (post.comment_count, post.is_visible) == (2, True), (
+        'Убедитесь, что при прерванной загрузке уже загруженные'
+        ' публикации всё равно обновляются.'
+    )
@@ -0,0 +1,72 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+
+from blog.comment_counts import BATCHED, JOIN, SUBQUERY
+from blog.models import Comment, Post
+from blog.views import IndexView
+
+pytestmark = [pytest.mark.django_db]
+
+
+def stored_count(post):
+    return Post.objects.get(pk=post.pk).comment_count
+
+
+def test_comment_count_follows_comment_writes(
+        mixer, user, post_with_published_location, post_of_another_author):
+    post = post_with_published_location
+    comments = mixer.cycle(3).blend(Comment, post=post, author=user)
+    assert stored_count(post) == 3, (
+        'Убедитесь, что при создании комментария увеличивается'
+        ' счётчик комментариев публикации.'
+    )
+    comments[0].delete()
+    assert stored_count(post) == 2, (
+        'Убедитесь, что при удалении комментария уменьшается'
+        ' счётчик комментариев публикации.'
+    )
+    comments[1].post = post_of_another_author
+    comments[1].save()
+    assert (stored_count(post), stored_count(post_of_another_author)) == (
+        1, 1
+    ), (
+        'Убедитесь, что при переносе комментария к другой публикации'
+        ' пересчитываются счётчики обеих публикаций.'
+    )
+    Comment.objects.all().delete()
+    assert stored_count(post) == stored_count(post_of_another_author) == 0, (
+        'Убедитесь, что массовое удаление комментариев обновляет счётчики.'
+    )
+
+
+def test_recount_comments_command(mixer, user, post_with_published_location):
+    post = post_with_published_location
+    mixer.cycle(4).blend(Comment, post=post, author=user)
+    Post.objects.filter(pk=post.pk).update(comment_count=0)
+    call_command('recount_comments', batch_size=1, stdout=StringIO())
+    assert stored_count(post) == 4, (
+        'Убедитесь, что команда `recount_comments` восстанавливает'
+        ' счётчики комментариев.'
+    )
+
+
+@pytest.mark.parametrize('strategy', (SUBQUERY, JOIN, BATCHED))
+def test_live_comment_count_strategies(
+        monkeypatch, client, mixer, user, many_posts_with_published_locations,
+        strategy):
+    monkeypatch.setattr(IndexView, 'comment_count_strategy', strategy)
+    posts = many_posts_with_published_locations
+    for number, post in enumerate(posts[:5], start=1):
+        mixer.cycle(number).blend(Comment, post=post, author=user)
+    Post.objects.update(comment_count=0)
+    page = client.get(reverse('blog:index')).context['page_obj']
+    expected = {
+        post.pk: post.comments.count() for post in page.object_list
+    }
+    assert {post.pk: post.comment_count for post in page} == expected, (
+        f'Убедитесь, что стратегия `{strategy}` подсчитывает комментарии'
+        ' публикаций на странице.'
+    )
@@ -0,0 +1,74 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+pytestmark = [pytest.mark.django_db]
+
+
+def conditional_get(client, url):
+    etag = client.get(url)['ETag']
+    with CaptureQueriesContext(connection) as captured:
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    return response, captured.captured_queries
+
+
+@pytest.mark.parametrize('client_name', ('client', 'user_client'))
+def test_feeds_answer_not_modified(
+        request, client_name, post_with_published_location):
+    client = request.getfixturevalue(client_name)
+    post = post_with_published_location
+    for url in (
+        reverse('blog:index'),
+        reverse('blog:category_posts', args=[post.category.slug]),
+        reverse('profile', args=[post.author.username]),
+        reverse('blog:post_detail', args=[post.id]),
+    ):
+        response, queries = conditional_get(client, url)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            f'Убедитесь, что страница `{url}` отвечает 304 Not Modified,'
+            ' если она не изменилась.'
+        )
+        assert not response.content
+        assert not any(
+            'ORDER BY' in query['sql'] for query in queries
+        ), (
+            f'Убедитесь, что при ответе 304 страница `{url}` не выполняет'
+            ' запросы ленты и комментариев.'
+        )
+
+
+def test_etag_changes_with_content(
+        mixer, user, user_client, post_with_published_location):
+    post = post_with_published_location
+    urls = (
+        reverse('blog:index'),
+        reverse('blog:post_detail', args=[post.id]),
+    )
+    etags = {url: user_client.get(url)['ETag'] for url in urls}
+    comment = mixer.blend('blog.Comment', post=post, author=user)
+    for url in urls:
+        response = user_client.get(url, HTTP_IF_NONE_MATCH=etags[url])
+        assert response.status_code == HTTPStatus.OK, (
+            f'Убедитесь, что после нового комментария страница `{url}`'
+            ' отдаётся заново.'
+        )
+    url = reverse('blog:post_detail', args=[post.id])
+    etag = user_client.get(url)['ETag']
+    comment.text = 'Исправленный комментарий'
+    comment.save()
+    response = user_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK, (
+        'Убедитесь, что после правки комментария страница публикации'
+        ' отдаётся заново.'
+    )
+
+
+def test_etag_depends_on_user(
+        user_client, another_user_client, post_with_published_location):
+    url = reverse('blog:index')
+    assert user_client.get(url)['ETag'] != another_user_client.get(url)[
+        'ETag'
+    ], 'Убедитесь, что ETag различается для разных пользователей.'
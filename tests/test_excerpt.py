@@ -0,0 +1,45 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+LONG_TEXT = ' '.join(f'слово{i}' for i in range(500))
+
+
+def test_excerpt_follows_text(post_with_published_location):
+    post = post_with_published_location
+    post.text = LONG_TEXT
+    post.save(update_fields=['text'])
+    excerpt = Post.objects.get(pk=post.pk).excerpt
+    assert excerpt == ' '.join(f'слово{i}' for i in range(10)) + ' …', (
+        'Убедитесь, что при сохранении публикации обновляется'
+        ' начало её текста.'
+    )
+
+
+def test_fill_excerpts_command(post_with_published_location):
+    Post.objects.update(text=LONG_TEXT, excerpt='')
+    call_command('fill_excerpts', stdout=StringIO())
+    assert Post.objects.get().excerpt.startswith('слово0 слово1'), (
+        'Убедитесь, что команда `fill_excerpts` заполняет начало текста.'
+    )
+
+
+def test_feed_does_not_load_text(client, post_with_published_location):
+    post = post_with_published_location
+    post.text = LONG_TEXT
+    post.save()
+    with CaptureQueriesContext(connection) as captured:
+        response = client.get(reverse('blog:index'))
+    assert 'слово9 …' in response.content.decode('utf-8')
+    assert not any(
+        'слово499' in query['sql'] or '"blog_post"."text"' in query['sql']
+        for query in captured.captured_queries
+    ), 'Убедитесь, что лента не загружает полный текст публикаций.'
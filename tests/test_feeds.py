@@ -0,0 +1,111 @@
+from http import HTTPStatus
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def feed_posts(mixer, user, published_category, published_location):
+    return mixer.cycle(3).blend(
+        'blog.Post', author=user, category=published_category,
+        location=published_location, is_published=True,
+        pub_date=timezone.now() - timezone.timedelta(days=1),
+    )
+
+
+def feed_urls(post):
+    slug, username = post.category.slug, post.author.username
+    return [
+        reverse(name, args=args)
+        for name, args in (
+            ('blog:feed_rss', []),
+            ('blog:feed_atom', []),
+            ('blog:category_feed_rss', [slug]),
+            ('blog:category_feed_atom', [slug]),
+            ('blog:author_feed_rss', [username]),
+            ('blog:author_feed_atom', [username]),
+        )
+    ]
+
+
+def test_feeds_list_visible_posts(mixer, client, feed_posts):
+    post = feed_posts[0]
+    hidden = [
+        mixer.blend(
+            'blog.Post', author=post.author, category=post.category,
+            title='Снятая с публикации', is_published=False,
+            pub_date=timezone.now() - timezone.timedelta(days=1),
+        ),
+        mixer.blend(
+            'blog.Post', author=post.author, category=post.category,
+            title='Отложенная публикация', is_published=True,
+            pub_date=timezone.now() + timezone.timedelta(days=1),
+        ),
+    ]
+    for url in feed_urls(post):
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        content = response.content.decode('utf-8')
+        for visible in feed_posts:
+            assert visible.title in content, (
+                f'Убедитесь, что лента `{url}` содержит опубликованные'
+                ' публикации.'
+            )
+        for invisible in hidden:
+            assert invisible.title not in content, (
+                f'Убедитесь, что лента `{url}` не содержит снятые с'
+                ' публикации и отложенные публикации.'
+            )
+
+
+def test_feed_unknown_owner(mixer, client):
+    category = mixer.blend('blog.Category', is_published=False)
+    for url in (
+        reverse('blog:category_feed_rss', args=[category.slug]),
+        reverse('blog:author_feed_atom', args=['nobody']),
+    ):
+        assert client.get(url).status_code == HTTPStatus.NOT_FOUND, (
+            'Убедитесь, что лента неопубликованной категории или'
+            ' несуществующего автора возвращает ошибку 404.'
+        )
+
+
+def test_feeds_served_from_cache(
+        client, feed_posts, django_assert_num_queries):
+    for url in feed_urls(feed_posts[0]):
+        etag = client.get(url)['ETag']
+        with django_assert_num_queries(0):
+            response = client.get(url)
+        assert response['ETag'] == etag, (
+            f'Убедитесь, что лента `{url}` отдаётся из кэша вместе с ETag.'
+        )
+        with django_assert_num_queries(0):
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            f'Убедитесь, что лента `{url}` отвечает 304 Not Modified.'
+        )
+
+
+def test_feeds_regenerated_on_post_write(client, user, feed_posts):
+    post = feed_posts[0]
+    etags = [client.get(url)['ETag'] for url in feed_urls(post)]
+    post.title = 'Новый заголовок'
+    post.save()
+    user.username = 'renamed_author'
+    user.save()
+    post.refresh_from_db()
+    for url, etag in zip(feed_urls(post), etags):
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK
+        content = response.content.decode('utf-8')
+        assert 'Новый заголовок' in content, (
+            f'Убедитесь, что лента `{url}` пересобирается после изменения'
+            ' публикации.'
+        )
+        assert 'renamed_author' in content, (
+            f'Убедитесь, что лента `{url}` пересобирается после изменения'
+            ' автора.'
+        )
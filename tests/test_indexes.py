@@ -0,0 +1,55 @@
+import pytest
+
+from blog.models import Post
+from blog.views import annotate_comments, filter_posts_by_date
+
+pytestmark = [pytest.mark.django_db]
+
+
+def query_plan(queryset):
+    return queryset[:10].explain()
+
+
+@pytest.mark.parametrize(
+    'make_queryset, index_name',
+    [
+        (
+            lambda post: filter_posts_by_date(
+                annotate_comments(Post.objects)
+            ),
+            'post_feed_idx',
+        ),
+        (
+            lambda post: filter_posts_by_date(
+                annotate_comments(post.category.posts.all())
+            ),
+            'post_category_feed_idx',
+        ),
+        (
+            lambda post: annotate_comments(post.author.posts),
+            'post_author_feed_idx',
+        ),
+        (
+            lambda post: filter_posts_by_date(
+                annotate_comments(post.author.posts)
+            ),
+            'post_author_feed_idx',
+        ),
+        (
+            lambda post: post.comments.select_related(
+                'author'
+            ).order_by('created_at'),
+            'comment_post_created_idx',
+        ),
+    ],
+    ids=['index', 'category', 'own profile', 'profile', 'comments'],
+)
+def test_feed_queries_use_indexes(
+        make_queryset, index_name, post_with_published_location):
+    plan = query_plan(make_queryset(post_with_published_location))
+    assert f'USING INDEX {index_name}' in plan, (
+        f'Убедитесь, что запрос использует индекс `{index_name}`:\n{plan}'
+    )
+    assert 'TEMP B-TREE' not in plan, (
+        f'Убедитесь, что сортировка выполняется по индексу:\n{plan}'
+    )
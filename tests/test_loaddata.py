@@ -0,0 +1,75 @@
+import json
+from io import StringIO
+
+import pytest
+from django.conf import settings
+from django.core.management import call_command
+from django.urls import reverse
+
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+FIXTURE = settings.BASE_DIR.parent / 'db.json'
+
+
+@pytest.fixture
+def loaded_posts():
+    call_command('loaddata', FIXTURE, stdout=StringIO())
+    return Post.objects.all()
+
+
+def test_loaddata_fills_updated_at(loaded_posts):
+    assert loaded_posts.count() == 39
+    assert not loaded_posts.filter(updated_at=None).exists(), (
+        'Убедитесь, что у публикаций из фикстуры заполняется'
+        ' время изменения.'
+    )
+
+
+def test_loaddata_marks_posts_visible(client, loaded_posts):
+    visible = loaded_posts.filter(
+        is_published=True, category__is_published=True
+    )
+    assert visible.exists()
+    assert set(loaded_posts.filter(is_visible=True)) == set(visible), (
+        'Убедитесь, что публикации из фикстуры видны в ленте, если они'
+        ' опубликованы вместе со своей категорией.'
+    )
+    assert client.get(reverse('blog:index')).context['page_obj'], (
+        'Убедитесь, что после loaddata публикации выводятся в ленте.'
+    )
+
+
+def test_loaddata_category_after_posts(tmp_path, user):
+    fixture = tmp_path / 'posts.json'
+    fixture.write_text(json.dumps([
+        {
+            'model': 'blog.post', 'pk': 1000,
+            'fields': {
+                'title': 'Публикация', 'text': 'Текст',
+                'is_published': True, 'created_at': '2022-12-18T23:06Z',
+                'pub_date': '2022-12-18T23:06Z', 'author': user.pk,
+                'category': 1000,
+            },
+        },
+        {
+            'model': 'blog.category', 'pk': 1000,
+            'fields': {
+                'title': 'Категория', 'slug': 'loaded',
+                'description': 'Описание', 'is_published': True,
+                'created_at': '2022-12-18T23:06Z',
+            },
+        },
+    ]), encoding='utf-8')
+    call_command('loaddata', fixture, stdout=StringIO())
+    assert Post.objects.get(pk=1000).is_visible, (
+        'Убедитесь, что публикация становится видимой, даже если её'
+        ' категория загружена из фикстуры позже.'
+    )
+
+
+def test_loaddata_fills_excerpt(loaded_posts):
+    assert not loaded_posts.filter(excerpt='').exclude(text='').exists(), (
+        'Убедитесь, что у публикаций из фикстуры заполняется начало текста.'
+    )
@@ -0,0 +1,45 @@
+import re
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [pytest.mark.django_db]
+
+
+def count_lookups(client, url, table, column, method='get'):
+    pattern = re.compile(
+        rf'FROM "{table}"( INNER| LEFT| WHERE).*"{table}"\."{column}" = ',
+    )
+    with CaptureQueriesContext(connection) as captured:
+        getattr(client, method)(url)
+    return sum(
+        1 for query in captured.captured_queries
+        if query['sql'].startswith('SELECT') and pattern.search(query['sql'])
+    )
+
+
+def test_each_lookup_runs_once(
+        mixer, user_client, user, post_with_published_location):
+    post = post_with_published_location
+    comment = mixer.blend('blog.Comment', post=post, author=user)
+    for url, table, column in (
+        (f'/posts/{post.id}/', 'blog_post', 'id'),
+        (f'/category/{post.category.slug}/', 'blog_category', 'slug'),
+        (f'/profile/{user.username}/', 'auth_user', 'username'),
+        (f'/profile/edit/{user.username}/', 'auth_user', 'username'),
+        (f'/posts/{post.id}/edit/', 'blog_post', 'id'),
+        (f'/posts/{post.id}/delete/', 'blog_post', 'id'),
+        (
+            f'/posts/{post.id}/edit_comment/{comment.id}',
+            'blog_comment', 'id'
+        ),
+        (
+            f'/posts/{post.id}/delete_comment/{comment.id}',
+            'blog_comment', 'id'
+        ),
+    ):
+        assert count_lookups(user_client, url, table, column) == 1, (
+            f'Убедитесь, что при загрузке страницы `{url}` объект'
+            ' запрашивается из базы данных только один раз.'
+        )
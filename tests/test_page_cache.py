@@ -0,0 +1,86 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [pytest.mark.django_db]
+
+
+def get_with_queries(client, url):
+    with CaptureQueriesContext(connection) as captured:
+        response = client.get(url)
+    return response, len(captured.captured_queries)
+
+
+def test_anonymous_feed_is_cached(
+        client, user, post_with_published_location):
+    post = post_with_published_location
+    for url in (
+        '/',
+        f'/category/{post.category.slug}/',
+        f'/profile/{user.username}/',
+    ):
+        first, _ = get_with_queries(client, url)
+        second, n_queries = get_with_queries(client, url)
+        assert n_queries == 0, (
+            f'Убедитесь, что страница `{url}` для анонимного пользователя'
+            ' отдаётся из кэша без запросов к базе данных.'
+        )
+        assert first.content == second.content
+
+
+def test_logged_in_feed_is_not_cached(
+        user_client, post_with_published_location):
+    user_client.get('/')
+    _, n_queries = get_with_queries(user_client, '/')
+    assert n_queries > 0, (
+        'Убедитесь, что страницы авторизованных пользователей не кэшируются.'
+    )
+
+
+def test_comment_evicts_only_pages_with_its_post(
+        mixer, client, user, post_with_published_location,
+        post_with_another_category):
+    post = post_with_published_location
+    other_url = f'/category/{post_with_another_category.category.slug}/'
+    urls = ('/', f'/category/{post.category.slug}/', other_url)
+    for url in urls:
+        client.get(url)
+    mixer.blend('blog.Comment', post=post, author=user)
+    for url in urls:
+        response, n_queries = get_with_queries(client, url)
+        if url == other_url:
+            assert n_queries == 0, (
+                'Убедитесь, что новый комментарий не сбрасывает кэш страниц,'
+                ' на которых нет прокомментированной публикации.'
+            )
+        else:
+            assert 'Комментарии (1)' in response.content.decode(), (
+                'Убедитесь, что новый комментарий сбрасывает кэш страниц,'
+                ' на которых выводится прокомментированная публикация.'
+            )
+
+
+def test_new_post_evicts_feed(
+        mixer, client, user, post_with_published_location):
+    post = post_with_published_location
+    client.get('/')
+    mixer.blend(
+        'blog.Post', author=user, category=post.category,
+        location=post.location, title='Свежая публикация',
+    )
+    assert 'Свежая публикация' in client.get('/').content.decode(), (
+        'Убедитесь, что новая публикация сбрасывает кэш ленты.'
+    )
+
+
+def test_unpublished_category_evicts_feed(
+        client, post_with_published_location):
+    post = post_with_published_location
+    post.title = 'Скрываемая публикация'
+    post.save()
+    assert post.title in client.get('/').content.decode()
+    post.category.is_published = False
+    post.category.save()
+    assert post.title not in client.get('/').content.decode(), (
+        'Убедитесь, что снятие категории с публикации сбрасывает кэш ленты.'
+    )
@@ -0,0 +1,135 @@
+from http import HTTPStatus
+
+import pytest
+from django.test import Client
+
+from blog.models import Post
+from blog.paginator import WindowPaginator
+from blog.views import CategoryView, IndexView
+from conftest import N_PER_PAGE
+from users.views import ProfileView
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def cursor_views(monkeypatch):
+    for view in (IndexView, CategoryView, ProfileView):
+        monkeypatch.setattr(view, 'cursor_pagination', True)
+
+
+def walk_feed(client: Client, url: str):
+    seen = []
+    response = client.get(url)
+    while True:
+        assert response.status_code == HTTPStatus.OK
+        page = response.context['page_obj']
+        seen.append([post.id for post in page])
+        if not page.next_cursor:
+            return seen, page
+        response = client.get(url, {'after': page.next_cursor})
+
+
+@pytest.mark.usefixtures('cursor_views')
+def test_cursor_pagination_walks_feed(
+        user_client, many_posts_with_published_locations,
+        published_category, user):
+    posts = sorted(
+        many_posts_with_published_locations,
+        key=lambda post: (post.pub_date, post.id),
+        reverse=True,
+    )
+    expected = [post.id for post in posts]
+    for url in (
+        '/',
+        f'/category/{published_category.slug}/',
+        f'/profile/{user.username}/',
+    ):
+        pages, last_page = walk_feed(user_client, url)
+        assert [len(page) for page in pages] == [N_PER_PAGE, N_PER_PAGE], (
+            'Убедитесь, что при курсорной пагинации на странице выводится'
+            f' не более {N_PER_PAGE} публикаций.'
+        )
+        assert sum(pages, []) == expected, (
+            'Убедитесь, что курсорная пагинация выводит публикации'
+            ' от новых к старым без пропусков и повторов.'
+        )
+        response = user_client.get(
+            url, {'before': last_page.previous_cursor}
+        )
+        assert [
+            post.id for post in response.context['page_obj']
+        ] == pages[0], (
+            'Убедитесь, что курсор «новее» возвращает предыдущую страницу.'
+        )
+
+
+@pytest.mark.usefixtures('cursor_views')
+def test_cursor_pagination_skips_count(
+        user_client, many_posts_with_published_locations,
+        django_assert_max_num_queries):
+    user_client.get('/')
+    with django_assert_max_num_queries(4) as captured:
+        user_client.get('/')
+    assert not any(
+        'COUNT(*)' in query['sql']
+        for query in captured.captured_queries
+    ), 'Убедитесь, что курсорная пагинация не считает общее число постов.'
+
+
+@pytest.mark.usefixtures('cursor_views')
+def test_invalid_cursor(user_client):
+    response = user_client.get('/', {'after': 'not-a-cursor'})
+    assert response.status_code == HTTPStatus.NOT_FOUND, (
+        'Убедитесь, что при неверном курсоре возвращается ошибка 404.'
+    )
+
+
+def test_window_paginator_elides_page_links(
+        many_posts_with_published_locations):
+    paginator = WindowPaginator(Post.objects.order_by('pk'), 1)
+    page_range = paginator.page(10).page_range
+    assert page_range == [
+        1, paginator.ELLIPSIS, 8, 9, 10, 11, 12, paginator.ELLIPSIS, 20
+    ], (
+        'Убедитесь, что пагинатор выводит первую и последнюю страницы'
+        ' и окно страниц вокруг текущей.'
+    )
+
+
+def test_window_paginator_caps_count(
+        monkeypatch, many_posts_with_published_locations):
+    monkeypatch.setattr(WindowPaginator, 'max_count', 15)
+    paginator = WindowPaginator(Post.objects.all(), N_PER_PAGE)
+    assert (paginator.count, paginator.count_capped) == (15, True), (
+        'Убедитесь, что пагинатор не считает записи дальше `max_count`.'
+    )
+    assert paginator.num_pages == 2
+
+
+def test_feed_renders_bounded_page_links(
+        monkeypatch, client, many_posts_with_published_locations):
+    monkeypatch.setattr(IndexView, 'paginate_by', 1)
+    content = client.get('/', {'page': 10}).content.decode('utf-8')
+    links = {f'page={i}"' for i in range(1, 21)}
+    rendered = {link for link in links if link in content}
+    assert rendered == {
+        'page=1"', 'page=8"', 'page=9"', 'page=11"', 'page=12"', 'page=20"'
+    }, 'Убедитесь, что в ленте выводится ограниченное окно ссылок.'
+
+
+def test_window_paginator_reaches_pages_past_count(
+        monkeypatch, client, many_posts_with_published_locations):
+    monkeypatch.setattr(WindowPaginator, 'max_count', 5)
+    first = client.get('/')
+    assert first.context['page_obj'].has_next()
+    response = client.get('/', {'page': 2})
+    assert response.status_code == HTTPStatus.OK, (
+        'Убедитесь, что страницы за пределами посчитанных записей'
+        ' доступны.'
+    )
+    page = response.context['page_obj']
+    assert len(page) == N_PER_PAGE and not page.has_next()
+    assert client.get('/', {'page': 3}).status_code == (
+        HTTPStatus.NOT_FOUND
+    )
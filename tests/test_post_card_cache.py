@@ -0,0 +1,129 @@
+import json
+import logging
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def card_lookups(caplog, client, url):
+    with caplog.at_level(logging.INFO, logger='blogicum.timing'):
+        client.get(url)
+    record = json.loads(caplog.records[-1].getMessage())
+    return record['card_hits'], record['card_misses']
+
+
+@pytest.fixture
+def feed(mixer, user, published_category, published_location):
+    return mixer.cycle(3).blend(
+        'blog.Post', author=user, category=published_category,
+        location=published_location, is_published=True,
+        pub_date=timezone.now() - timezone.timedelta(days=1),
+    )
+
+
+def test_card_rendered_once_across_feeds(caplog, user_client, feed):
+    post = feed[0]
+    assert card_lookups(caplog, user_client, reverse('blog:index')) == (
+        0, len(feed)
+    )
+    for url in (
+        reverse('blog:category_posts', args=[post.category.slug]),
+        reverse('profile', args=[post.author.username]),
+    ):
+        assert card_lookups(caplog, user_client, url) == (len(feed), 0), (
+            'Убедитесь, что карточка публикации рендерится один раз'
+            ' для всех лент, пока публикация не изменится.'
+        )
+
+
+def test_card_lookups_in_server_timing(user_client, feed):
+    response = user_client.get(reverse('blog:index'))
+    assert f'cards;desc="0 hits, {len(feed)} misses"' in (
+        response['Server-Timing']
+    ), (
+        'Убедитесь, что попадания и промахи кэша карточек передаются'
+        ' в заголовке Server-Timing.'
+    )
+
+
+def test_category_description_keeps_cards(feed):
+    post = feed[0]
+    updated_at = post.updated_at
+    post.category.description = 'Новое описание'
+    post.category.save()
+    assert Post.objects.get(pk=post.pk).updated_at == updated_at, (
+        'Убедитесь, что изменение полей категории, которые не выводятся'
+        ' в карточке, не сбрасывает кэш карточек её публикаций.'
+    )
+
+
+def test_card_follows_related_changes(user_client, mixer, user, feed):
+    post = feed[0]
+    user_client.get(reverse('blog:index'))
+    mixer.blend('blog.Comment', post=post, author=user)
+    content = user_client.get(reverse('blog:index')).content.decode('utf-8')
+    assert 'Комментарии (1)' in content, (
+        'Убедитесь, что новый комментарий обновляет карточку публикации.'
+    )
+    post.category.title = 'Новое название категории'
+    post.category.save()
+    post.location.name = 'Новое место'
+    post.location.save()
+    user.username = 'renamed_author'
+    user.save()
+    content = user_client.get(reverse('blog:index')).content.decode('utf-8')
+    for expected in ('Новое название категории', 'Новое место',
+                     '@renamed_author'):
+        assert expected in content, (
+            'Убедитесь, что изменение категории, места или автора'
+            ' обновляет карточки публикаций.'
+        )
+
+
+def test_deleting_location_touches_only_its_posts(mixer, user, feed):
+    post = feed[0]
+    other = mixer.blend('blog.Post', author=user, location=None)
+    updated_at = Post.objects.get(pk=other.pk).updated_at
+    post.location.delete()
+    assert Post.objects.get(pk=other.pk).updated_at == updated_at, (
+        'Убедитесь, что удаление места не сбрасывает карточки публикаций'
+        ' без места.'
+    )
+    assert Post.objects.get(pk=post.pk).updated_at > post.updated_at
+
+
+def test_deleting_category_touches_only_its_posts(mixer, user, feed):
+    post = feed[0]
+    other = mixer.blend('blog.Post', author=user, category=None)
+    updated_at = Post.objects.get(pk=other.pk).updated_at
+    post.category.delete()
+    assert Post.objects.get(pk=other.pk).updated_at == updated_at, (
+        'Убедитесь, что удаление категории не сбрасывает карточки'
+        ' публикаций без категории.'
+    )
+    deleted = Post.objects.get(pk=post.pk)
+    assert not deleted.is_visible and deleted.updated_at > post.updated_at
+
+
+def test_unpublishing_category_touches_posts_in_batches(feed):
+    category = feed[0].category
+    category.is_published = False
+    with CaptureQueriesContext(connection) as captured:
+        category.save()
+    updates = [
+        query['sql'] for query in captured
+        if query['sql'].startswith('UPDATE "blog_post"')
+    ]
+    assert updates and all(
+        '"blog_post"."id" IN' in sql for sql in updates
+    ), (
+        'Убедитесь, что публикации категории обновляются пачками'
+        ' по первичному ключу.'
+    )
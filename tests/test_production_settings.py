@@ -0,0 +1,76 @@
+import importlib
+import sys
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+
+from blogicum.db.sqlite.base import DatabaseWrapper
+
+PRODUCTION_SETTINGS = 'blogicum.settings_production'
+
+
+def import_production_settings():
+    sys.modules.pop(PRODUCTION_SETTINGS, None)
+    return importlib.import_module(PRODUCTION_SETTINGS)
+
+
+def test_production_settings_require_secret_key(monkeypatch):
+    monkeypatch.delenv('DJANGO_SECRET_KEY', raising=False)
+    with pytest.raises(ImproperlyConfigured):
+        import_production_settings()
+
+
+def test_production_settings_profile(monkeypatch):
+    monkeypatch.setenv('DJANGO_SECRET_KEY', 'production-secret')
+    production = import_production_settings()
+    assert production.SECRET_KEY == 'production-secret'
+    assert not production.DEBUG
+    assert 'debug_toolbar' not in production.INSTALLED_APPS
+    assert not any(
+        middleware.startswith('debug_toolbar.')
+        for middleware in production.MIDDLEWARE
+    ), 'Убедитесь, что в боевых настройках отключён debug_toolbar.'
+    database = production.DATABASES['default']
+    assert database['CONN_MAX_AGE'], (
+        'Убедитесь, что в боевых настройках соединения с БД переиспользуются.'
+    )
+    loaders = production.TEMPLATES[0]['OPTIONS']['loaders']
+    assert loaders[0][0] == 'django.template.loaders.cached.Loader'
+    assert production.CACHES['default']['BACKEND'] == (
+        'django.core.cache.backends.filebased.FileBasedCache'
+    ), (
+        'Убедитесь, что в боевых настройках кэш общий для всех процессов.'
+    )
+
+
+def test_sqlite_backend_applies_pragmas(tmp_path):
+    pragmas = {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'busy_timeout': 4321,
+        'temp_store': 'MEMORY',
+    }
+    wrapper = DatabaseWrapper({
+        'NAME': str(tmp_path / 'db.sqlite3'),
+        'OPTIONS': {'pragmas': pragmas},
+        'TIME_ZONE': None,
+        'CONN_MAX_AGE': 0,
+        'AUTOCOMMIT': True,
+        'ATOMIC_REQUESTS': False,
+        'USER': '', 'PASSWORD': '', 'HOST': '', 'PORT': '',
+        'TEST': {},
+    })
+    connection = wrapper.get_new_connection(wrapper.get_connection_params())
+    try:
+        values = {
+            name: connection.execute(f'PRAGMA {name}').fetchone()[0]
+            for name in pragmas
+        }
+    finally:
+        connection.close()
+    assert values == {
+        'journal_mode': 'wal',
+        'synchronous': 1,
+        'busy_timeout': 4321,
+        'temp_store': 2,
+    }, 'Убедитесь, что бэкенд SQLite применяет PRAGMA из настроек.'
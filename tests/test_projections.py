@@ -0,0 +1,50 @@
+import pytest
+from django.db.models import Model
+from django.urls import reverse
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def forbid_deferred_loading(monkeypatch):
+    refresh_from_db = Model.refresh_from_db
+
+    def strict_refresh_from_db(self, using=None, fields=None):
+        if fields is not None:
+            raise AssertionError(
+                f'Шаблон обратился к неотобранным полям {list(fields)}'
+                f' модели {type(self).__name__}, что вызвало'
+                ' дополнительный запрос к базе.'
+            )
+        return refresh_from_db(self, using, fields)
+
+    monkeypatch.setattr(Model, 'refresh_from_db', strict_refresh_from_db)
+
+
+@pytest.fixture
+def feed_post(mixer, user, published_category, published_location):
+    post = mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        location=published_location, title='Проекция полей',
+        text='Текст публикации о проекции полей', is_published=True,
+    )
+    mixer.cycle(3).blend('blog.Comment', post=post, author=user)
+    return post
+
+
+@pytest.mark.parametrize('client_name', ('client', 'user_client'))
+def test_list_pages_use_only_selected_fields(
+        request, client_name, feed_post, forbid_deferred_loading):
+    client = request.getfixturevalue(client_name)
+    for url, data in (
+        (reverse('blog:index'), {}),
+        (reverse('blog:category_posts', args=[feed_post.category.slug]), {}),
+        (reverse('profile', args=[feed_post.author.username]), {}),
+        (reverse('blog:post_detail', args=[feed_post.id]), {}),
+        (reverse('blog:search'), {'q': 'проекция'}),
+    ):
+        response = client.get(url, data)
+        assert response.status_code == 200, (
+            f'Страница `{url}` вернула код {response.status_code}.'
+        )
+        assert len(response.context['page_obj']) > 0
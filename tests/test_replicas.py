@@ -0,0 +1,159 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.contrib.sessions.models import Session
+from django.core.management import call_command
+from django.db import connections
+from django.urls import reverse
+
+from blog.models import Category, Location, Post
+from blogicum.routers import PIN_COOKIE, ReplicaRouter, replica_reads
+
+REPLICA_FILE_ALIAS = 'replica_file'
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def routed_reads(settings, monkeypatch):
+    settings.DATABASE_REPLICAS = ['replica1']
+    aliases = []
+    db_for_read = ReplicaRouter.db_for_read
+
+    def spy(self, model, **hints):
+        aliases.append(db_for_read(self, model, **hints))
+        return 'default'
+
+    monkeypatch.setattr(ReplicaRouter, 'db_for_read', spy)
+    return aliases
+
+
+@pytest.fixture
+def replica_file(settings, tmp_path):
+    """Настоящая вторая база SQLite в файле вместо зеркала основной."""
+    connections.settings[REPLICA_FILE_ALIAS] = {
+        **connections['default'].settings_dict,
+        'NAME': str(tmp_path / 'replica.sqlite3'),
+        'TEST': {},
+    }
+    try:
+        call_command(
+            'migrate', database=REPLICA_FILE_ALIAS, verbosity=0,
+            interactive=False,
+        )
+        settings.DATABASE_REPLICAS = [REPLICA_FILE_ALIAS]
+        yield REPLICA_FILE_ALIAS
+    finally:
+        connections[REPLICA_FILE_ALIAS].close()
+        del connections[REPLICA_FILE_ALIAS]
+        del connections.settings[REPLICA_FILE_ALIAS]
+
+
+def copy_to_replica(alias, *querysets):
+    for queryset in querysets:
+        queryset.model._base_manager.using(alias).bulk_create(queryset)
+
+
+def test_router_uses_replicas_only_when_allowed():
+    router = ReplicaRouter()
+    assert router.db_for_read(Post) == 'default'
+    token = replica_reads.set('replica1')
+    try:
+        assert router.db_for_read(Post) == 'replica1'
+        assert router.db_for_read(Session) == 'default', (
+            'Убедитесь, что сессии всегда читаются из основной базы.'
+        )
+        assert router.db_for_write(Post) == 'default'
+    finally:
+        replica_reads.reset(token)
+
+
+def test_read_only_views_use_replica(
+        user_client, routed_reads, post_with_published_location):
+    post = post_with_published_location
+    for url in (
+        reverse('blog:index'),
+        reverse('blog:post_detail', args=[post.id]),
+        reverse('profile', args=[post.author.username]),
+        reverse('pages:about'),
+    ):
+        routed_reads.clear()
+        user_client.get(url)
+        assert 'replica1' in routed_reads, (
+            f'Убедитесь, что страница `{url}` читает данные из реплики.'
+        )
+
+
+def test_request_reads_from_one_replica(
+        settings, user_client, routed_reads, post_with_published_location):
+    settings.DATABASE_REPLICAS = [f'replica{number}' for number in range(8)]
+    for _ in range(5):
+        routed_reads.clear()
+        user_client.get(reverse('blog:index'))
+        assert len(set(routed_reads) - {'default'}) == 1, (
+            'Убедитесь, что все чтения одного запроса идут в одну реплику.'
+        )
+
+
+def test_reads_stick_to_primary_after_write(
+        user_client, routed_reads, post_with_published_location):
+    post = post_with_published_location
+    user_client.get(reverse('blog:edit_post', args=[post.id]))
+    assert 'replica1' not in routed_reads, (
+        'Убедитесь, что страницы редактирования читают из основной базы.'
+    )
+    response = user_client.post(
+        reverse('blog:add_comment', args=[post.id]), {'text': 'Комментарий'}
+    )
+    assert PIN_COOKIE in response.cookies
+    routed_reads.clear()
+    user_client.get(reverse('blog:post_detail', args=[post.id]))
+    assert routed_reads and 'replica1' not in routed_reads, (
+        'Убедитесь, что после записи чтения пользователя идут'
+        ' в основную базу.'
+    )
+    assert not replica_reads.get()
+
+
+def test_reads_from_replica_file(
+        user_client, replica_file, post_with_published_location):
+    post = post_with_published_location
+    copy_to_replica(
+        replica_file,
+        get_user_model().objects.all(), Category.objects.all(),
+        Location.objects.all(), Post.objects.all(),
+    )
+    Post.objects.using(replica_file).filter(pk=post.pk).update(
+        title='Заголовок из реплики'
+    )
+    url = reverse('blog:post_detail', args=[post.id])
+    assert 'Заголовок из реплики' in user_client.get(url).content.decode(), (
+        'Убедитесь, что страница публикации читает данные из реплики.'
+    )
+    user_client.post(
+        reverse('blog:add_comment', args=[post.id]), {'text': 'Комментарий'}
+    )
+    content = user_client.get(url).content.decode()
+    assert post.title in content and 'Комментарий' in content, (
+        'Убедитесь, что после записи чтения пользователя идут'
+        ' в основную базу, а не в реплику.'
+    )
+
+
+def test_cached_pages_built_from_primary(
+        client, replica_file, post_with_published_location):
+    post = post_with_published_location
+    copy_to_replica(
+        replica_file,
+        get_user_model().objects.all(), Category.objects.all(),
+        Location.objects.all(), Post.objects.all(),
+    )
+    Post.objects.using(replica_file).filter(pk=post.pk).update(
+        title='Заголовок из реплики'
+    )
+    for _ in range(2):
+        content = client.get(reverse('blog:index')).content.decode()
+        assert post.title in content
+        assert 'Заголовок из реплики' not in content, (
+            'Убедитесь, что страницы для кэша строятся по основной базе,'
+            ' а не по отстающей реплике.'
+        )
@@ -0,0 +1,103 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from blog.models import Post
+from blog.search import FTS_TABLE, search_posts
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def searchable_posts(mixer, user, published_category, published_location):
+    def blend(title, text, **kwargs):
+        return mixer.blend(
+            'blog.Post', author=user, category=published_category,
+            location=published_location, title=title, text=text, **kwargs
+        )
+
+    return {
+        'title': blend('Кошки на крыше', 'Про животных'),
+        'text': blend('Заметка', 'Вчера видел кошки во дворе и собак'),
+        'other': blend('Погода', 'Сегодня дождь'),
+        'hidden': blend('Скрытые кошки', 'кошки', is_published=False),
+        'future': blend(
+            'Будущие кошки', 'кошки',
+            pub_date=timezone.now() + timezone.timedelta(days=1),
+        ),
+    }
+
+
+def result_ids(client, query):
+    response = client.get('/search/', {'q': query})
+    return [post.id for post in response.context['page_obj']]
+
+
+def test_search_ranks_and_filters(client, searchable_posts):
+    assert result_ids(client, 'кошки') == [
+        searchable_posts['title'].id, searchable_posts['text'].id
+    ], (
+        'Убедитесь, что поиск находит только видимые публикации и ставит'
+        ' совпадения в заголовке выше совпадений в тексте.'
+    )
+    assert result_ids(client, 'кош') == result_ids(client, 'кошки'), (
+        'Убедитесь, что поиск находит слова по началу.'
+    )
+    assert result_ids(client, '"; DROP') == []
+
+
+def test_search_snippet_highlight(client, searchable_posts):
+    content = client.get('/search/', {'q': 'собак'}).content.decode()
+    assert '<mark>собак</mark>' in content, (
+        'Убедитесь, что совпадения в результатах поиска выделяются.'
+    )
+
+
+def test_index_follows_post_writes(searchable_posts):
+    post = searchable_posts['other']
+    post.title = 'Ливень'
+    post.save()
+    assert list(search_posts(Post.objects.all(), 'ливень')) == [post]
+    post.delete()
+    assert not search_posts(Post.objects.all(), 'ливень').exists(), (
+        'Убедитесь, что удалённые публикации исключаются из индекса.'
+    )
+
+
+def test_rebuild_search_index(searchable_posts):
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE}')
+    assert not search_posts(Post.objects.all(), 'кошки').exists()
+    call_command('rebuild_search_index', batch_size=2, stdout=StringIO())
+    assert search_posts(Post.objects.all(), 'кошки').count() == 4, (
+        'Убедитесь, что команда `rebuild_search_index` восстанавливает'
+        ' полнотекстовый индекс.'
+    )
+
+
+def test_rebuild_search_index_replaces_rows_by_range(searchable_posts):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'INSERT INTO {FTS_TABLE} (rowid, title, text)'
+            " VALUES (100000, 'кошки', 'кошки')"
+        )
+    with CaptureQueriesContext(connection) as captured:
+        call_command('rebuild_search_index', batch_size=2, stdout=StringIO())
+    assert not any(
+        query['sql'].strip() == f'DELETE FROM {FTS_TABLE}'
+        for query in captured
+    ), (
+        'Убедитесь, что команда `rebuild_search_index` не очищает индекс'
+        ' целиком: на это время поиск перестаёт находить публикации.'
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(f'SELECT COUNT(*) FROM {FTS_TABLE}')
+        rows = cursor.fetchone()[0]
+    assert rows == Post.objects.count(), (
+        'Убедитесь, что перестройка индекса удаляет строки удалённых'
+        ' публикаций.'
+    )
@@ -0,0 +1,35 @@
+import json
+import logging
+
+import pytest
+
+from blogicum.middleware import QueryBudgetExceeded
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_server_timing_header(user_client, post_with_published_location):
+    response = user_client.get('/')
+    metrics = {
+        part.split(';')[0].strip()
+        for part in response['Server-Timing'].split(',')
+    }
+    assert {'db', 'view', 'tpl', 'total'} <= metrics, (
+        'Убедитесь, что в заголовке Server-Timing передаётся время запросов'
+        ' к базе данных, работы view, шаблонов и всего запроса.'
+    )
+
+
+def test_timing_log_line(caplog, client):
+    with caplog.at_level(logging.INFO, logger='blogicum.timing'):
+        client.get('/pages/about/')
+    record = json.loads(caplog.records[-1].getMessage())
+    assert record['url_name'] == 'pages:about'
+    assert record['queries'] == 0
+
+
+def test_query_budget(settings, user_client, post_with_published_location):
+    settings.QUERY_BUDGETS = {'blog:index': 1}
+    settings.QUERY_BUDGET_RAISE = True
+    with pytest.raises(QueryBudgetExceeded):
+        user_client.get('/')
@@ -0,0 +1,91 @@
+import re
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+
+from blog.models import Post
+from blog.sitemaps import INDEX_NAME, build_sitemaps
+from blog.views import filter_posts_by_date
+
+pytestmark = [pytest.mark.django_db]
+
+BASE_URL = 'https://blogicum.example'
+LIMIT = 8
+
+
+def read_locations(path):
+    return re.findall(r'<loc>(.*?)</loc>', path.read_text(encoding='utf-8'))
+
+
+def sitemap_urls(root):
+    urls = []
+    for location in read_locations(root / INDEX_NAME):
+        urls.extend(read_locations(root / location.rsplit('/', 1)[1]))
+    return urls
+
+
+def test_sitemaps_list_visible_pages(
+        tmp_path, mixer, user, published_category,
+        many_posts_with_published_locations):
+    hidden = mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        is_published=False,
+    )
+    build_sitemaps(tmp_path, BASE_URL, LIMIT)
+    urls = sitemap_urls(tmp_path)
+    expected = {
+        BASE_URL + reverse('blog:post_detail', args=[post.id])
+        for post in filter_posts_by_date(Post.objects.all())
+    } | {
+        BASE_URL + reverse(
+            'blog:category_posts', args=[published_category.slug]
+        ),
+        BASE_URL + reverse('profile', args=[user.username]),
+    }
+    assert len(urls) == len(expected) and set(urls) == expected, (
+        'Убедитесь, что sitemap содержит опубликованные публикации,'
+        ' их категории и профили авторов.'
+    )
+    assert BASE_URL + reverse(
+        'blog:post_detail', args=[hidden.id]
+    ) not in urls
+    for path in tmp_path.glob('sitemap-*.xml'):
+        assert len(read_locations(path)) <= LIMIT, (
+            'Убедитесь, что в файле sitemap не больше заданного числа'
+            ' адресов.'
+        )
+
+
+def test_sitemaps_rebuild_only_changed_files(
+        tmp_path, many_posts_with_published_locations):
+    first = build_sitemaps(tmp_path, BASE_URL, LIMIT)
+    assert first.written == first.files
+    assert build_sitemaps(tmp_path, BASE_URL, LIMIT).written == 0, (
+        'Убедитесь, что без изменений файлы sitemap не перезаписываются.'
+    )
+    post = Post.objects.order_by('pk').last()
+    post.title = 'Новый заголовок'
+    post.save()
+    assert build_sitemaps(tmp_path, BASE_URL, LIMIT).written == 3, (
+        'Убедитесь, что после изменения публикации перезаписываются'
+        ' только файлы с ней, её категорией и автором.'
+    )
+    Post.objects.filter(pk__gte=post.pk // LIMIT * LIMIT).delete()
+    result = build_sitemaps(tmp_path, BASE_URL, LIMIT)
+    assert result.removed == 1
+    assert not (tmp_path / f'sitemap-posts-{post.pk // LIMIT}.xml').exists()
+    assert BASE_URL + reverse(
+        'blog:post_detail', args=[post.pk]
+    ) not in sitemap_urls(tmp_path)
+
+
+def test_build_sitemaps_command(
+        tmp_path, many_posts_with_published_locations):
+    out = StringIO()
+    call_command(
+        'build_sitemaps', root=tmp_path, base_url=BASE_URL, stdout=out
+    )
+    assert 'перезаписано' in out.getvalue()
+    assert (tmp_path / INDEX_NAME).exists()
@@ -0,0 +1,111 @@
+from io import BytesIO, StringIO
+
+import pytest
+from django.core.files.images import ImageFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from PIL import Image
+
+from blog.images import variant_name
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    return tmp_path
+
+
+@pytest.fixture
+def post_with_large_image(
+        media_root, mixer, user, published_location, published_category):
+    img_io = BytesIO()
+    Image.new('RGB', (800, 600), color=(73, 109, 137)).save(
+        img_io, format='JPEG'
+    )
+    return mixer.blend(
+        'blog.Post',
+        location=published_location,
+        category=published_category,
+        author=user,
+        image=ImageFile(img_io, name='large.jpg'),
+    )
+
+
+def variant_names(post):
+    name = post.image.name
+    return [
+        f'{name}.320w.jpg', f'{name}.320w.webp',
+        f'{name}.640w.jpg', f'{name}.640w.webp',
+        f'{name}.webp',
+    ]
+
+
+def test_variants_generated_on_upload(client, post_with_large_image):
+    post = Post.objects.get(pk=post_with_large_image.pk)
+    assert (post.image_width, post.image_height) == (800, 600), (
+        'Убедитесь, что при загрузке изображения сохраняются его размеры.'
+    )
+    for name in variant_names(post):
+        assert default_storage.exists(name), (
+            'Убедитесь, что при загрузке изображения создаются уменьшенные'
+            f' копии и WebP-версии: не найден файл `{name}`.'
+        )
+    content = client.get('/').content.decode()
+    for fragment in (
+        'srcset=', 'type="image/webp"', 'width="800"', 'height="600"',
+        'loading="lazy"', '.320w.jpg 320w',
+    ):
+        assert fragment in content, (
+            'Убедитесь, что в карточке публикации выводятся адаптивные'
+            f' изображения: не найден фрагмент `{fragment}`.'
+        )
+
+
+def test_generate_thumbnails_backfills(client, post_with_large_image):
+    post = post_with_large_image
+    for name in variant_names(post):
+        default_storage.delete(name)
+    Post.objects.filter(pk=post.pk).update(image_size=None)
+    assert 'srcset=' not in client.get('/').content.decode()
+    call_command('generate_thumbnails', stdout=StringIO())
+    assert 'srcset=' in client.get('/').content.decode(), (
+        'Убедитесь, что после `generate_thumbnails` карточки в ленте'
+        ' выводят уменьшенные копии.'
+    )
+    assert Post.objects.get(pk=post.pk).image_width == 800
+    assert all(
+        default_storage.exists(name) for name in variant_names(post)
+    ), 'Убедитесь, что команда `generate_thumbnails` создаёт копии.'
+
+
+def test_variants_do_not_collide_across_formats():
+    for width, extension in ((320, None), (320, 'webp'), (None, 'webp')):
+        assert variant_name('a.jpg', width, extension) != variant_name(
+            'a.png', width, extension
+        ), (
+            'Убедитесь, что копии изображений с одинаковым именем, но разными'
+            ' расширениями не совпадают.'
+        )
+    assert variant_name('a.png', 320, 'webp') == 'a.png.320w.webp'
+
+
+def test_variants_deleted_with_image(post_with_large_image):
+    post = post_with_large_image
+    old_names = variant_names(post)
+    post.image = None
+    post.save()
+    assert not any(default_storage.exists(name) for name in old_names), (
+        'Убедитесь, что копии удаляются при замене изображения.'
+    )
+
+
+def test_variants_deleted_with_post(post_with_large_image):
+    post = post_with_large_image
+    names = variant_names(post)
+    post.delete()
+    assert not any(default_storage.exists(name) for name in names), (
+        'Убедитесь, что копии удаляются вместе с публикацией.'
+    )
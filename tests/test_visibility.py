@@ -0,0 +1,111 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from blog import visibility
+from blog.cache import VISIBILITY_TAG, get_tag_versions
+from blog.constants import VISIBILITY_MAX_AGE
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def scheduled_post(mixer, user, post_with_published_location):
+    post = post_with_published_location
+    return mixer.blend(
+        'blog.Post', author=user, category=post.category,
+        location=post.location, title='Отложенная публикация',
+        pub_date=timezone.now() + timedelta(hours=1),
+    )
+
+
+def test_scheduled_post_appears_without_restart(
+        client, monkeypatch, scheduled_post):
+    assert scheduled_post.title not in client.get('/').content.decode(), (
+        'Убедитесь, что отложенная публикация не видна до даты публикации.'
+    )
+    later = timezone.now() + timedelta(hours=2)
+    monkeypatch.setattr(visibility, 'now', lambda: later)
+    assert scheduled_post.title in client.get('/').content.decode(), (
+        'Убедитесь, что отложенная публикация появляется в ленте, когда'
+        ' наступает дата публикации.'
+    )
+
+
+def test_cutoff_is_stable_until_next_publication(scheduled_post):
+    cutoff = visibility.visibility_cutoff()
+    with CaptureQueriesContext(connection) as captured:
+        assert visibility.visibility_cutoff() == cutoff, (
+            'Убедитесь, что граница видимости не меняется, пока не наступила'
+            ' дата ближайшей отложенной публикации.'
+        )
+    assert not captured.captured_queries
+
+
+def test_cutoff_catches_up_with_other_processes(
+        client, monkeypatch, post_with_published_location):
+    post = post_with_published_location
+    cutoff = visibility.visibility_cutoff()
+    Post.objects.filter(pk=post.pk).update(
+        pub_date=cutoff + timedelta(seconds=1)
+    )
+    assert post.title not in client.get('/').content.decode()
+    later = timezone.now() + timedelta(seconds=VISIBILITY_MAX_AGE + 2)
+    monkeypatch.setattr(visibility, 'now', lambda: later)
+    assert post.title in client.get('/').content.decode(), (
+        'Убедитесь, что публикация, сохранённая другим процессом, появляется'
+        f' в ленте не позже чем через {VISIBILITY_MAX_AGE} секунд.'
+    )
+
+
+def test_cutoff_refresh_keeps_pages_without_new_posts(
+        monkeypatch, post_with_published_location):
+    visibility.visibility_cutoff()
+    versions = get_tag_versions({VISIBILITY_TAG})
+    later = timezone.now() + timedelta(seconds=VISIBILITY_MAX_AGE + 2)
+    monkeypatch.setattr(visibility, 'now', lambda: later)
+    assert visibility.visibility_cutoff() == later
+    assert get_tag_versions({VISIBILITY_TAG}) == versions, (
+        'Убедитесь, что сдвиг границы видимости без новых публикаций'
+        ' не сбрасывает закэшированные страницы.'
+    )
+
+
+def test_unpublished_category_hides_posts_in_batches(
+        mixer, user, published_category):
+    posts = mixer.cycle(12).blend(
+        'blog.Post', author=user, category=published_category,
+        is_published=True,
+    )
+    assert all(post.is_visible for post in posts)
+    published_category.is_published = False
+    with CaptureQueriesContext(connection) as captured:
+        published_category.save()
+    assert not Post.objects.filter(is_visible=True).exists(), (
+        'Убедитесь, что снятие категории с публикации скрывает её публикации.'
+    )
+    assert len(captured) < len(posts), (
+        'Убедитесь, что публикации категории обновляются пачками,'
+        ' а не по одной.'
+    )
+    published_category.is_published = True
+    published_category.save()
+    assert Post.objects.filter(is_visible=True).count() == len(posts)
+
+
+def test_refresh_post_visibility_command(post_with_published_location):
+    Post.objects.update(is_visible=False)
+    call_command('refresh_post_visibility', batch_size=1, stdout=StringIO())
+    assert Post.objects.get().is_visible, (
+        'Убедитесь, что команда `refresh_post_visibility` восстанавливает'
+        ' флаг видимости публикаций.'
+    )
+    Post.objects.update(is_published=False)
+    call_command('refresh_post_visibility', stdout=StringIO())
+    assert not Post.objects.get().is_visible